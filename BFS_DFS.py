@@ -1,7 +1,25 @@
+import sys
 import time
 import heapq #Para ucs y A*
 from collections import deque
+from array import array #arreglos planos para padres y costos
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor #para la matriz de costos por lotes
+import multiprocessing
+import os
 import math #importamos la libreria de math para las heuristicas
+import mmap #para cargar archivos grandes sin copiarlos
+import re
+import struct #formato binario del laberinto
+import zlib
+import hashlib #huella del laberinto para el cache de resultados
+import pickle
+from collections import OrderedDict
+
+try:
+    import numpy as np #opcional, solo para el BFS vectorizado
+except ImportError:
+    np = None
 
 
 RESET = "\033[0m"
@@ -11,6 +29,31 @@ YELLOW = "\033[93m"
 GRAY = "\033[90m"
 BLUE = "\033[94m"   # nuevo color para marcar los nodos abiertos en la impresion del algoritmo A*
 
+PARED = ord('#')
+
+#tabla simbolo -> costo de entrar a la celda, se usa para precalcular el arreglo de costos
+COSTOS = {'S': 0, 'G': 0, '.': 1, ',': 5, '~': 10}
+COSTO_INFINITO = 255 #marca en el arreglo de costos para simbolos que no estan en la tabla
+
+#JPS decide por bloques de BLOQUE_JPS x BLOQUE_JPS celdas: en un bloque con menos de esta fraccion
+#de celdas libres uniformes casi todo es punto de salto, los saltos no avanzan y cuestan mas que
+#un paso, asi que sus celdas se expanden como en astar y solo se salta desde los bloques uniformes
+FRACCION_UNIFORME_JPS = 0.9
+BLOQUE_JPS = 16
+
+#tope de expansiones de SMA* por celda del laberinto cuando no se pasa max_expansiones: con poca
+#memoria regenera los mismos nodos sin fin, con este tope se rinde y regresa None
+EXPANSIONES_SMA_POR_CELDA = 50
+
+#celdas que se recorren al cerrar una celda para ver si partio su componente (ver Componentes)
+CELDAS_REVISION_CORTE = 1024
+
+#bits de la mascara de direcciones transitables de cada celda
+ARRIBA = 1
+ABAJO = 2
+IZQUIERDA = 4
+DERECHA = 8
+
 
 
 LABERINTO_DEFAULT = """
@@ -27,54 +70,560 @@ LABERINTO_DEFAULT = """
 ###################
 """.strip("\n")
 
+
+#representacion compacta del laberinto: un byte por celda en un bytearray plano
+#cada celda se identifica con un solo entero, indice = fila * paso_fila + columna.
+#paso_fila es lo que mide una fila en celdas, normalmente igual a ancho; en un archivo mapeado
+#a memoria incluye el salto de linea, esas columnas extra nunca son transitables
+class Grid:
+    def __init__(self, celdas, ancho, alto, tabla_costos=COSTOS, paso_fila=None):
+        self.celdas = celdas
+        self.ancho = ancho
+        self.alto = alto
+        self.paso_fila = ancho if paso_fila is None else paso_fila
+        self.posiciones = {} #indices ya conocidos de 'S' y 'G', los llena el cargador si los encuentra
+        self.tabla_costos = tabla_costos
+        #se llenan una sola vez con precalcular()
+        self.costos = None
+        self.mascaras = None
+        self.salidas = None
+        self.solver = None #contexto de busqueda, se crea con obtener_solver()
+        self.huella = None #hash del contenido, se calcula con huella_laberinto()
+        self.componentes = None #componentes conexas, se crean con obtener_componentes()
+
+    def indice(self, pos):
+        return pos[0] * self.paso_fila + pos[1]
+
+    def posicion(self, indice):
+        return divmod(indice, self.paso_fila)
+
+    def simbolo(self, indice):
+        return chr(self.celdas[indice])
+
+    #regresa cada fila como texto, se usa para imprimir
+    def filas(self):
+        for i in range(self.alto):
+            inicio = i * self.paso_fila
+            yield self.celdas[inicio:inicio + self.ancho].decode('latin-1')
+
+
 def cargar_laberinto(texto):
-    return [list(fila) for fila in texto.splitlines()]
+    lineas = texto.splitlines()
+    ancho = max((len(fila) for fila in lineas), default=0)
+    celdas = bytearray()
+    for fila in lineas:
+        #las filas mas cortas se rellenan con pared para que todas midan lo mismo
+        celdas += fila.ljust(ancho, '#').encode('latin-1', 'replace')
+    return Grid(celdas, ancho, len(lineas))
+
+
+#carga un archivo de laberinto sin copiarlo: el archivo se mapea a memoria y se usa tal cual
+#como rejilla de bytes, cada fila mide ancho + el salto de linea ('\n' o '\r\n').
+#todas las filas tienen que medir lo mismo, si no se lanza ValueError (para esos archivos
+#esta cargar_laberinto). 'S' y 'G' se buscan en una sola pasada
+def cargar_laberinto_mmap(ruta):
+    with open(ruta, 'rb') as f:
+        #ACCESS_COPY: se puede modificar la rejilla en memoria sin tocar el archivo
+        datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    #los espacios y saltos de linea al final no cuentan, igual que el strip() del cargador de texto.
+    #la rejilla sigue siendo todo el mmap pero precalcular() no deja pisar nada despues de la ultima fila
+    fin = len(datos)
+    while fin > 0 and datos[fin - 1] in b' \t\r\n':
+        fin -= 1
+    if fin == 0:
+        raise ValueError("El archivo esta vacio")
+
+    primer_salto = datos.find(b'\n', 0, fin)
+    if primer_salto == -1:
+        ancho = fin
+        terminador = b'\n'
+    elif primer_salto > 0 and datos[primer_salto - 1] == ord('\r'):
+        ancho = primer_salto - 1
+        terminador = b'\r\n'
+    else:
+        ancho = primer_salto
+        terminador = b'\n'
+    paso_fila = ancho + len(terminador)
+
+    if (fin + len(terminador)) % paso_fila != 0:
+        raise ValueError("Las filas del laberinto no miden lo mismo")
+    alto = (fin + len(terminador)) // paso_fila
+    for fila in range(alto):
+        inicio = fila * paso_fila
+        if datos.find(b'\n', inicio, inicio + ancho) != -1:
+            raise ValueError(f"La fila {fila + 1} es mas corta que las demas")
+        if fila < alto - 1 and datos[inicio + ancho:inicio + paso_fila] != terminador:
+            raise ValueError(f"La fila {fila + 1} es mas larga que las demas")
+
+    laberinto = Grid(datos, ancho, alto, paso_fila=paso_fila)
+    for encontrado in re.compile(b'[SG]').finditer(datos, 0, fin):
+        simbolo = chr(encontrado.group()[0])
+        if simbolo not in laberinto.posiciones:
+            laberinto.posiciones[simbolo] = encontrado.start()
+            if len(laberinto.posiciones) == 2:
+                break
+    return laberinto
+
+
+#formato binario del laberinto (.lab):
+#  [celdas][tabla de costos][pie]
+#las celdas van primero, un byte por celda sin saltos de linea, asi el archivo sin comprimir se
+#mapea a memoria desde el byte 0 y se usa como rejilla sin copiar nada. la tabla de costos son
+#pares (simbolo, costo) de un byte cada uno. el pie tiene tamano fijo y va al final del archivo:
+#firma, version, compresion, cuantos costos hay, ancho, alto, indices de 'S' y 'G' (-1 si no estan)
+#y cuantos bytes ocupan las celdas guardadas
+FIRMA_BINARIO = b'LABB'
+VERSION_BINARIO = 1
+PIE_BINARIO = struct.Struct('<4sBBHIIqqQ')
+SIN_COMPRESION = 0
+COMPRESION_RLE = 1
+COMPRESION_ZLIB = 2
+COMPRESIONES = {None: SIN_COMPRESION, 'rle': COMPRESION_RLE, 'zlib': COMPRESION_ZLIB}
+
+
+#run-length: pares (repeticiones, byte) con repeticiones de 1 a 255
+def comprimir_rle(datos):
+    salida = bytearray()
+    for corrida in re.finditer(rb'(.)\1{0,254}', datos, re.S):
+        salida.append(corrida.end() - corrida.start())
+        salida.append(datos[corrida.start()])
+    return salida
+
+
+def descomprimir_rle(datos):
+    if len(datos) % 2:
+        raise ValueError("Datos RLE incompletos")
+    return bytearray().join(bytes(datos[i + 1:i + 2]) * datos[i] for i in range(0, len(datos), 2))
+
+
+#las celdas sin el relleno de fin de fila (si el laberinto viene de cargar_laberinto_mmap)
+def celdas_compactas(laberinto):
+    if laberinto.paso_fila == laberinto.ancho:
+        return laberinto.celdas
+    compactas = bytearray()
+    for i in range(laberinto.alto):
+        inicio = i * laberinto.paso_fila
+        compactas += laberinto.celdas[inicio:inicio + laberinto.ancho]
+    return compactas
+
+
+#guarda el laberinto en el formato binario, compresion puede ser None, 'rle' o 'zlib'
+def guardar_laberinto_binario(laberinto, ruta, compresion=None):
+    if compresion not in COMPRESIONES:
+        raise ValueError(f"Compresion desconocida: {compresion}")
+    celdas = celdas_compactas(laberinto)
+    if compresion == 'rle':
+        celdas = comprimir_rle(celdas)
+    elif compresion == 'zlib':
+        celdas = zlib.compress(celdas)
+
+    costos = bytearray()
+    for simbolo, costo in laberinto.tabla_costos.items():
+        if not 0 <= costo < COSTO_INFINITO:
+            raise ValueError(f"El costo de '{simbolo}' no cabe en un byte")
+        costos += bytes([ord(simbolo), costo])
+
+    marcas = []
+    for simbolo in 'SG':
+        pos = encontrar_posicion(laberinto, simbolo)
+        marcas.append(-1 if pos is None else pos[0] * laberinto.ancho + pos[1])
+
+    pie = PIE_BINARIO.pack(FIRMA_BINARIO, VERSION_BINARIO, COMPRESIONES[compresion], len(costos) // 2,
+                           laberinto.ancho, laberinto.alto, marcas[0], marcas[1], len(celdas))
+    with open(ruta, 'wb') as f:
+        f.write(celdas)
+        f.write(costos)
+        f.write(pie)
+
+
+#regresa el pie del archivo o None si no es un laberinto binario
+def leer_pie_binario(f):
+    f.seek(0, os.SEEK_END)
+    tamano = f.tell()
+    if tamano < PIE_BINARIO.size:
+        return None
+    f.seek(tamano - PIE_BINARIO.size)
+    pie = PIE_BINARIO.unpack(f.read(PIE_BINARIO.size))
+    if pie[0] != FIRMA_BINARIO:
+        return None
+    return pie, tamano
+
+
+#carga un laberinto binario. sin compresion las celdas se mapean a memoria tal cual (ACCESS_COPY,
+#igual que cargar_laberinto_mmap), comprimido se lee y se descomprime a un bytearray
+def cargar_laberinto_binario(ruta):
+    with open(ruta, 'rb') as f:
+        leido = leer_pie_binario(f)
+        if leido is None:
+            raise ValueError("El archivo no es un laberinto binario")
+        (_, version, compresion, n_costos, ancho, alto, inicio, meta, largo), tamano = leido
+        if version != VERSION_BINARIO:
+            raise ValueError(f"Version de formato no soportada: {version}")
+        if largo + 2 * n_costos + PIE_BINARIO.size != tamano:
+            raise ValueError("El archivo binario esta truncado")
+
+        f.seek(largo)
+        costos = f.read(2 * n_costos)
+        tabla_costos = {chr(costos[i]): costos[i + 1] for i in range(0, len(costos), 2)}
+
+        if compresion == SIN_COMPRESION:
+            if largo == 0:
+                celdas = bytearray()
+            else:
+                celdas = mmap.mmap(f.fileno(), largo, access=mmap.ACCESS_COPY)
+        else:
+            f.seek(0)
+            datos = f.read(largo)
+            if compresion == COMPRESION_RLE:
+                celdas = descomprimir_rle(datos)
+            elif compresion == COMPRESION_ZLIB:
+                celdas = bytearray(zlib.decompress(datos))
+            else:
+                raise ValueError(f"Compresion desconocida: {compresion}")
 
+    if len(celdas) != ancho * alto:
+        raise ValueError("El tamano de las celdas no coincide con ancho x alto")
+    laberinto = Grid(celdas, ancho, alto, tabla_costos)
+    if inicio != -1:
+        laberinto.posiciones['S'] = inicio
+    if meta != -1:
+        laberinto.posiciones['G'] = meta
+    return laberinto
 
-def encontrar_posicion(laberinto, simbolo):
-    for i, fila in enumerate(laberinto): 
-        for j, celda in enumerate(fila):
-            if celda == simbolo:
-                return (i, j)
-    return None
 
+#convierte un laberinto de texto (como laberinto1.txt) al formato binario
+def convertir_a_binario(ruta_texto, ruta_binaria, compresion=None):
+    guardar_laberinto_binario(abrir_laberinto(ruta_texto), ruta_binaria, compresion)
 
-def vecinos(laberinto, pos):
-    x, y = pos
-    movimientos = [(-1,0), (1,0), (0,-1), (0,1)]
-    for dx, dy in movimientos:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < len(laberinto) and 0 <= ny < len(laberinto[0]):
-            if laberinto[nx][ny] != '#':
-                yield (nx, ny)
 
+#abre cualquier laberinto: binario si trae el pie, si no texto mapeado a memoria y si las
+#filas no miden lo mismo se lee como texto y se rellenan con pared
+def abrir_laberinto(ruta):
+    with open(ruta, 'rb') as f:
+        binario = leer_pie_binario(f) is not None
+    if binario:
+        return cargar_laberinto_binario(ruta)
+    try:
+        return cargar_laberinto_mmap(ruta)
+    except ValueError:
+        with open(ruta, 'r') as f:
+            return cargar_laberinto(f.read().strip())
 
-#nueva funcion para el calculo del costo de la celda practica2
-def costo_celda(laberinto, pos):
-    x, y = pos
-    simbolo = laberinto[x][y]
 
-    if simbolo == 'S' or simbolo == 'G':
+def encontrar_posicion(laberinto, simbolo):
+    if simbolo in laberinto.posiciones:
+        return laberinto.posicion(laberinto.posiciones[simbolo])
+    indice = laberinto.celdas.find(simbolo.encode('latin-1'))
+    if indice == -1:
+        return None
+    return laberinto.posicion(indice)
+
+
+#translate por bloques, asi un laberinto mapeado a memoria no se copia completo de una vez
+def traducir(celdas, tabla, bloque=1 << 24):
+    total = len(celdas)
+    if isinstance(celdas, (bytes, bytearray)):
+        return bytearray(celdas).translate(tabla)
+    resultado = bytearray(total)
+    for inicio in range(0, total, bloque):
+        resultado[inicio:inicio + bloque] = celdas[inicio:inicio + bloque].translate(tabla)
+    return resultado
+
+
+#etapa de precalculo, se hace una sola vez por laberinto:
+#- costos: un byte por celda con el costo de entrar a ella (COSTO_INFINITO si el simbolo no esta en la tabla)
+#- mascaras: un byte por celda con un bit por cada vecino transitable (ARRIBA, ABAJO, IZQUIERDA, DERECHA)
+#- salidas: para cada una de las 16 mascaras, los desplazamientos de indice de sus vecinos
+#todo se arma con translate y operaciones sobre enteros grandes, asi no hay un ciclo de python por celda
+def precalcular(laberinto):
+    if laberinto.mascaras is not None:
+        return laberinto
+
+    celdas = laberinto.celdas
+    ancho = laberinto.ancho
+    paso = laberinto.paso_fila
+    total = len(celdas)
+
+    tabla = bytearray([COSTO_INFINITO]) * 256
+    for simbolo, costo in laberinto.tabla_costos.items():
+        tabla[ord(simbolo)] = costo
+    laberinto.costos = traducir(celdas, tabla)
+
+    #1 si la celda se puede pisar (todo lo que no es pared, igual que antes)
+    pasable = bytearray([1]) * 256
+    pasable[PARED] = 0
+    pasable = traducir(celdas, pasable)
+    #las columnas de relleno despues de cada fila (saltos de linea) no se pisan
+    for columna in range(ancho, paso):
+        pasable[columna::paso] = bytearray(len(range(columna, total, paso)))
+    #ni lo que sobra despues de la ultima fila (lineas en blanco al final de un archivo mapeado)
+    fin_rejilla = laberinto.alto * paso
+    if fin_rejilla < total:
+        pasable[fin_rejilla:] = bytearray(total - fin_rejilla)
+
+    arriba = bytearray(min(paso, total)) + pasable[:max(total - paso, 0)]
+    abajo = pasable[paso:] + bytearray(min(paso, total))
+    izquierda = bytearray(1) + pasable[:-1]
+    derecha = pasable[1:] + bytearray(1)
+    #en los bordes izquierdo y derecho no se puede dar la vuelta a la otra fila
+    if ancho > 0:
+        izquierda[0::paso] = bytearray(len(range(0, total, paso)))
+        derecha[ancho - 1::paso] = bytearray(len(range(ancho - 1, total, paso)))
+
+    mascara = 0
+    for bit, desplazado in ((ARRIBA, arriba), (ABAJO, abajo), (IZQUIERDA, izquierda), (DERECHA, derecha)):
+        desplazado = desplazado.translate(bytes([0, bit]) + bytes(254))
+        mascara |= int.from_bytes(desplazado, 'little')
+    mascara &= int.from_bytes(pasable.translate(bytes([0, 15]) + bytes(254)), 'little') #las paredes no tienen salidas
+    laberinto.mascaras = bytearray(mascara.to_bytes(total, 'little'))
+
+    desplazamientos = ((ARRIBA, -paso), (ABAJO, paso), (IZQUIERDA, -1), (DERECHA, 1))
+    laberinto.salidas = tuple(
+        tuple(d for bit, d in desplazamientos if m & bit) for m in range(16)
+    )
+    return laberinto
+
+
+#los vecinos salen de la mascara precalculada, en el mismo orden: arriba, abajo, izquierda, derecha
+def vecinos(laberinto, actual):
+    precalcular(laberinto)
+    for d in laberinto.salidas[laberinto.mascaras[actual]]:
+        yield actual + d
+
+
+#mascara de una sola celda, igual a la que arma precalcular pero sin recorrer todo el laberinto
+def mascara_celda(laberinto, indice):
+    celdas = laberinto.celdas
+    paso = laberinto.paso_fila
+    fila, columna = divmod(indice, paso)
+    if columna >= laberinto.ancho or celdas[indice] == PARED:
         return 0
-    elif simbolo == '.':
-        return 1
-    elif simbolo == ',':
-        return 5
-    elif simbolo == '~':
-        return 10
-    else:
-        return float('inf')  
+    mascara = 0
+    if fila > 0 and celdas[indice - paso] != PARED:
+        mascara |= ARRIBA
+    if fila < laberinto.alto - 1 and indice + paso < len(celdas) and celdas[indice + paso] != PARED:
+        mascara |= ABAJO
+    if columna > 0 and celdas[indice - 1] != PARED:
+        mascara |= IZQUIERDA
+    if columna < laberinto.ancho - 1 and celdas[indice + 1] != PARED:
+        mascara |= DERECHA
+    return mascara
+
+
+#indices de las celdas vecinas que estan dentro del laberinto, sin importar si son pared
+def vecinos_en_rejilla(laberinto, indice):
+    paso = laberinto.paso_fila
+    fila, columna = divmod(indice, paso)
+    if fila > 0:
+        yield indice - paso
+    if fila < laberinto.alto - 1 and indice + paso < len(laberinto.celdas):
+        yield indice + paso
+    if columna > 0:
+        yield indice - 1
+    if columna < laberinto.ancho - 1:
+        yield indice + 1
+
+
+#cambia celdas del laberinto, cambios es una lista de (posicion, simbolo).
+#solo se recalculan el costo y la mascara de cada celda editada y de sus vecinas, y se invalida
+#lo que dependia del contenido: la huella, las tablas de JPS y las posiciones de 'S'/'G'.
+#las componentes conexas, si ya existen, se actualizan sin recalcularlas completas.
+#regresa los indices de las celdas que si cambiaron
+def editar_celdas(laberinto, cambios):
+    precalcular(laberinto)
+    tabla_costos = laberinto.tabla_costos
+    cambiadas = []
+    abiertas = []
+    cerradas = []
+    for pos, simbolo in cambios:
+        fila, columna = pos
+        if not (0 <= fila < laberinto.alto and 0 <= columna < laberinto.ancho):
+            raise ValueError(f"La posicion {pos} esta fuera del laberinto")
+        indice = laberinto.indice(pos)
+        valor = ord(simbolo)
+        if laberinto.celdas[indice] == valor:
+            continue
+        if chr(laberinto.celdas[indice]) in laberinto.posiciones or simbolo in 'SG':
+            laberinto.posiciones.clear()
+        if laberinto.celdas[indice] == PARED:
+            abiertas.append(indice)
+        elif valor == PARED:
+            cerradas.append(indice)
+        laberinto.celdas[indice] = valor
+        laberinto.costos[indice] = tabla_costos.get(simbolo, COSTO_INFINITO)
+        cambiadas.append(indice)
+
+    if not cambiadas:
+        return cambiadas
+    for indice in cambiadas:
+        laberinto.mascaras[indice] = mascara_celda(laberinto, indice)
+        for v in vecinos_en_rejilla(laberinto, indice):
+            laberinto.mascaras[v] = mascara_celda(laberinto, v)
+
+    laberinto.huella = None
+    if laberinto.componentes is not None:
+        laberinto.componentes.actualizar(abiertas, cerradas)
+    solver = laberinto.solver
+    if solver is not None:
+        solver.tablas_jps.clear()
+        solver.columnas_jps.clear()
+        solver.uniformes_jps = None
+        solver.saltos_jps = None
+        solver.inicio = solver.buscar('S')
+        solver.meta = solver.buscar('G')
+    return cambiadas
+
+
+#componentes conexas de las celdas transitables (las que no son pared), siguiendo las mascaras.
+#cada celda guarda el numero de su componente (-1 las paredes) y los numeros se juntan con
+#union-find, asi saber si dos celdas estan conectadas es O(1) y no hace falta buscar.
+#al editar: abrir una celda solo une componentes; cerrar una puede partir la componente, entonces
+#se busca desde sus vecinas hasta CELDAS_REVISION_CORTE celdas: los pedazos chicos que se
+#separaron reciben etiqueta nueva y si queda un solo pedazo grande se queda con la etiqueta vieja.
+#si quedan dos o mas pedazos grandes no se sabe si se separaron sin recorrerlos, la componente
+#se marca sucia y se vuelve a etiquetar en la siguiente consulta que la toque, por pedazos
+class Componentes:
+    def __init__(self, laberinto):
+        self.laberinto = precalcular(laberinto)
+        self.etiquetas = array('i', [-1]) * len(laberinto.celdas)
+        self.raices = array('i')
+        self.sucias = set() #raices de componentes que pudieron partirse
+        self.etiquetar()
+
+    def nueva(self):
+        self.raices.append(len(self.raices))
+        return len(self.raices) - 1
+
+    def raiz(self, etiqueta):
+        raices = self.raices
+        while raices[etiqueta] != etiqueta:
+            raices[etiqueta] = raices[raices[etiqueta]]
+            etiqueta = raices[etiqueta]
+        return etiqueta
+
+    #si una de las dos estaba sucia la union tambien lo esta
+    def unir(self, a, b):
+        a = self.raiz(a)
+        b = self.raiz(b)
+        if a != b:
+            self.raices[b] = a
+            if b in self.sucias:
+                self.sucias.discard(b)
+                self.sucias.add(a)
+
+    #raiz de la componente de la celda; si esta sucia, el pedazo de la celda se vuelve a etiquetar
+    def raiz_limpia(self, celda):
+        raiz = self.raiz(self.etiquetas[celda])
+        if raiz in self.sucias:
+            raiz = self.nueva()
+            self.inundar(celda, raiz)
+        return raiz
+
+    def conectadas(self, a, b):
+        if self.etiquetas[a] == -1 or self.etiquetas[b] == -1:
+            return a == b
+        return self.raiz_limpia(a) == self.raiz_limpia(b)
+
+    #recorrido a lo ancho desde la celda, todo lo alcanzado recibe la etiqueta
+    def inundar(self, inicio, etiqueta):
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+        etiquetas = self.etiquetas
+        etiquetas[inicio] = etiqueta
+        cola = deque([inicio])
+        while cola:
+            actual = cola.popleft()
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                if etiquetas[v] != etiqueta:
+                    etiquetas[v] = etiqueta
+                    cola.append(v)
+
+    def etiquetar(self):
+        laberinto = self.laberinto
+        celdas = laberinto.celdas
+        etiquetas = self.etiquetas
+        for fila in range(laberinto.alto):
+            base = fila * laberinto.paso_fila
+            for i in range(base, min(base + laberinto.ancho, len(celdas))):
+                if etiquetas[i] == -1 and celdas[i] != PARED:
+                    self.inundar(i, self.nueva())
+
+    #recorrido a lo ancho desde la celda de a lo mucho CELDAS_REVISION_CORTE celdas, quita de
+    #pendientes las que alcanza. regresa las celdas alcanzadas si recorrio todo su pedazo, o None
+    def explorar(self, inicio, pendientes):
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+        alcanzadas = {inicio}
+        cola = deque([inicio])
+        while cola:
+            actual = cola.popleft()
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                if v not in alcanzadas:
+                    alcanzadas.add(v)
+                    pendientes.discard(v)
+                    cola.append(v)
+            if len(alcanzadas) > CELDAS_REVISION_CORTE:
+                return None
+        return alcanzadas
+
+    #abiertas: celdas que eran pared y ya no, cerradas: celdas que se volvieron pared.
+    #primero se parte lo cerrado (con etiquetas nuevas) y despues se une lo abierto
+    def actualizar(self, abiertas, cerradas):
+        laberinto = self.laberinto
+        etiquetas = self.etiquetas
+        viejas = []
+        for indice in cerradas:
+            if etiquetas[indice] != -1:
+                viejas.append((indice, self.raiz(etiquetas[indice])))
+            etiquetas[indice] = -1
+        grandes = {} #raiz vieja -> pedazos grandes que salieron de ella
+        for indice, raiz in viejas:
+            if raiz in self.sucias:
+                continue
+            pendientes = {v for v in vecinos_en_rejilla(laberinto, indice) if laberinto.celdas[v] != PARED}
+            while pendientes:
+                alcanzadas = self.explorar(pendientes.pop(), pendientes)
+                if alcanzadas is None:
+                    grandes[raiz] = grandes.get(raiz, 0) + 1
+                else:
+                    etiqueta = self.nueva()
+                    for v in alcanzadas:
+                        etiquetas[v] = etiqueta
+        for raiz, cuantos in grandes.items():
+            if cuantos > 1:
+                self.sucias.add(raiz)
+        for indice in abiertas:
+            if etiquetas[indice] == -1:
+                etiquetas[indice] = self.nueva()
+            for d in laberinto.salidas[laberinto.mascaras[indice]]:
+                self.unir(etiquetas[indice], etiquetas[indice + d])
+
+
+def obtener_componentes(laberinto):
+    if laberinto.componentes is None:
+        laberinto.componentes = Componentes(laberinto)
+    return laberinto.componentes
+
+
+#nueva funcion para el calculo del costo de la celda practica2
+#ahora se consulta la tabla de costos en lugar de la cadena de if/elif
+def costo_celda(laberinto, actual):
+    return laberinto.tabla_costos.get(laberinto.simbolo(actual), float('inf'))
 
 
 #nueva funcion para calcular el costo de los caminos con peso practica2
+#la celda de inicio no cuenta, igual que en ucs/astar solo se paga por entrar a una celda
 def costo_camino(laberinto, camino):
-    if len(camino) == 0:
+    if not camino:
         return float('inf')
 
     else:
         total = 0
-    for pos in camino:
-        total = total + costo_celda(laberinto, pos)
+    for pos in camino[1:]:
+        total = total + costo_celda(laberinto, laberinto.indice(pos))
 
     return total
 
@@ -86,277 +635,2178 @@ def heuristica_euclidiana(a, b):
     return math.sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2)
 
 
-def bfs(laberinto):
-    
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
-
-    cola = deque([inicio])
-    visitados = set([inicio])
-    padre = {}
-    nodos_visitados = 0
-
-    while cola:                                                      #la cola continua mientras haya nodos en la cola, si la cola esta vacia, no hay mas caminos posibles
-        actual = cola.popleft()
-        nodos_visitados = nodos_visitados + 1 #afectada
+#cola de prioridad de Dial (cubetas) para prioridades enteras: una lista por prioridad y un cursor
+#que avanza de uno en uno hasta la siguiente cubeta con algo. como los costos de celda son
+#enteros chicos las prioridades pendientes siempre estan cerca del minimo, asi que meter y sacar
+#son O(1) amortizado. las cubetas van en un diccionario, asi el cursor tambien puede regresar
+#si una heuristica baja la prioridad (por ejemplo al entrar a 'G' que cuesta 0)
+class ColaCubetas:
+    def __init__(self):
+        self.cubetas = {}
+        self.minimo = 0
+        self.cantidad = 0
 
-        if actual == meta:
-            break
+    def __len__(self):
+        return self.cantidad
 
-        for v in vecinos(laberinto, actual):
-            if v not in visitados:
-                visitados.add(v)
-                padre[v] = actual
-                cola.append(v)
+    def __iter__(self):
+        for cubeta in self.cubetas.values():
+            yield from cubeta
 
-    # Reconstrucción del camino
+    def meter(self, entrada):
+        prioridad = entrada[0]
+        try:
+            self.cubetas[prioridad].append(entrada)
+        except KeyError:
+            self.cubetas[prioridad] = [entrada]
+            if prioridad < self.minimo:
+                self.minimo = prioridad
+        self.cantidad += 1
+
+    def sacar(self):
+        cubetas = self.cubetas
+        prioridad = self.minimo
+        cubeta = cubetas.get(prioridad)
+        while not cubeta:
+            cubetas.pop(prioridad, None)
+            prioridad += 1
+            cubeta = cubetas.get(prioridad)
+        self.minimo = prioridad
+        self.cantidad -= 1
+        return cubeta.pop()
+
+
+#regresa la cola y sus funciones de meter/sacar, las dos guardan tuplas (prioridad, celda).
+#'heap' es el heapq de siempre, 'cubetas' es la cola de Dial y solo sirve con prioridades enteras
+def crear_cola(tipo):
+    if tipo == 'heap':
+        cola = []
+        return cola, partial(heapq.heappush, cola), partial(heapq.heappop, cola)
+    elif tipo == 'cubetas':
+        cola = ColaCubetas()
+        return cola, cola.meter, cola.sacar
+    raise ValueError(f"Tipo de cola desconocido: {tipo}")
+
+
+#sigue los padres desde la meta hasta el inicio y regresa el camino como lista de coordenadas
+def reconstruir_camino(laberinto, padre, inicio, meta):
     camino = []
     actual = meta
     while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
-            return None, nodos_visitados
-    camino.append(inicio)
+        camino.append(laberinto.posicion(actual))
+        actual = padre[actual]
+        if actual == -1:
+            return None
+    camino.append(laberinto.posicion(inicio))
     camino.reverse()
-    
-    
-
-    return camino, nodos_visitados
-
-
-
-def dfs(laberinto):
-  
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
-
-    pila = [inicio]
-    visitados = set([inicio])
-    padre = {}
-    nodos_visitados = 0
+    return camino
+
+
+#contexto reutilizable para muchas consultas sobre el mismo laberinto:
+#guarda las posiciones de 'S' y 'G' y los arreglos planos de visitados/padre/costos.
+#en lugar de limpiar los arreglos entre consultas se usa un contador de generacion,
+#una celda cuenta como vista o cerrada solo si su marca es igual a la generacion actual
+class Solver:
+    def __init__(self, laberinto):
+        self.laberinto = precalcular(laberinto)
+        self.inicio = self.buscar('S')
+        self.meta = self.buscar('G')
+
+        total = len(laberinto.celdas)
+        self.vistos = array('I', [0]) * total    #generacion en la que se descubrio la celda
+        self.cerrados = array('I', [0]) * total  #generacion en la que se expandio la celda
+        self.padre = array('i', [-1]) * total
+        self.costos = array('I', [0]) * total    #solo vale si vistos[celda] == generacion
+        self.atras = None                        #arreglos de la busqueda bidireccional
+        self.tablas_jps = {}                     #tablas por fila de JPS, ver fila_jps()
+        self.columnas_jps = {}                   #tablas por columna de JPS, ver columna_jps()
+        self.uniformes_jps = None                #uniformes de todas las filas en un solo arreglo
+        self.saltos_jps = None                   #celdas desde las que JPS salta, ver celdas_de_salto()
+        self.generacion = 0
+
+    def buscar(self, simbolo):
+        if simbolo in self.laberinto.posiciones:
+            return self.laberinto.posiciones[simbolo]
+        indice = self.laberinto.celdas.find(simbolo.encode('latin-1'))
+        return None if indice == -1 else indice
+
+    #empieza una consulta nueva sin tocar los arreglos, solo cambia la generacion
+    def nueva_generacion(self):
+        self.generacion += 1
+        if self.generacion == 0xFFFFFFFF:
+            #se acabo el rango de la marca, ahora si se limpian los arreglos
+            total = len(self.vistos)
+            self.vistos = array('I', [0]) * total
+            self.cerrados = array('I', [0]) * total
+            self.atras = None
+            self.generacion = 1
+        return self.generacion
+
+    #convierte las coordenadas de una consulta a indices, por defecto se usa 'S' -> 'G'.
+    #meta puede ser una coordenada o una lista de coordenadas, la busqueda termina en la primera que alcance
+    def extremos(self, inicio=None, meta=None):
+        if inicio is None:
+            if self.inicio is None:
+                raise ValueError("El laberinto no tiene 'S', hay que indicar el inicio")
+            inicio = self.inicio
+        else:
+            inicio = self.indice(inicio)
+
+        if meta is None:
+            if self.meta is None:
+                raise ValueError("El laberinto no tiene 'G', hay que indicar la meta")
+            metas = {self.meta}
+        elif len(meta) == 0:
+            raise ValueError("Se necesita al menos una meta")
+        elif isinstance(meta[0], int):
+            metas = {self.indice(meta)}
+        else:
+            metas = set(self.indice(m) for m in meta)
+        return inicio, metas
+
+    #True si ninguna meta esta en la componente del inicio: no hay camino y no hace falta buscar.
+    #etiquetar todo el laberinto cuesta mas que una busqueda, asi que solo se revisa si ya se
+    #pidieron las componentes con obtener_componentes (para muchas consultas sobre el mismo mapa)
+    def sin_conexion(self, inicio, metas):
+        componentes = self.laberinto.componentes
+        if componentes is None:
+            return False
+        return not any(componentes.conectadas(inicio, m) for m in metas)
+
+    def indice(self, pos):
+        laberinto = self.laberinto
+        fila, columna = pos
+        if not (0 <= fila < laberinto.alto and 0 <= columna < laberinto.ancho):
+            raise ValueError(f"La posicion {pos} esta fuera del laberinto")
+        return laberinto.indice(pos)
+
+    def camino(self, inicio, meta):
+        if meta == -1 or self.vistos[meta] != self.generacion:
+            return None
+        return reconstruir_camino(self.laberinto, self.padre, inicio, meta)
+
+    def bfs(self, inicio=None, meta=None):
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0
+        meta = -1
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+
+        gen = self.nueva_generacion()
+        vistos = self.vistos
+        padre = self.padre
+
+        cola = deque([inicio])
+        vistos[inicio] = gen
+        padre[inicio] = -1
+        nodos_visitados = 0
+
+        while cola:                                                      #la cola continua mientras haya nodos en la cola, si la cola esta vacia, no hay mas caminos posibles
+            actual = cola.popleft()
+            nodos_visitados = nodos_visitados + 1 #afectada
+
+            if actual in metas:
+                meta = actual
+                break
+
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                if vistos[v] != gen:
+                    vistos[v] = gen
+                    padre[v] = actual
+                    cola.append(v)
+
+        # Reconstrucción del camino
+        return self.camino(inicio, meta), nodos_visitados
+
+    def dfs(self, inicio=None, meta=None):
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0
+        meta = -1
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+
+        gen = self.nueva_generacion()
+        vistos = self.vistos
+        padre = self.padre
+
+        pila = [inicio]
+        vistos[inicio] = gen
+        padre[inicio] = -1
+        nodos_visitados = 0
+
+        while pila:                                                                 #se ejecuta mientras haya nodos en la pila, si la pila esta vacia no hay mas caminos
+            actual = pila.pop()
+            nodos_visitados = nodos_visitados + 1 #afectada
+
+            if actual in metas:
+                meta = actual
+                break
+
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                if vistos[v] != gen:
+                    vistos[v] = gen
+                    padre[v] = actual
+                    pila.append(v)
+
+        # Reconstrucción del camino
+        return self.camino(inicio, meta), nodos_visitados
+
+    #algoritmo de costos uniformes
+    def ucs(self, inicio=None, meta=None, cola='heap'):
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        meta, nodos_visitados = self.dijkstra(inicio, metas, cola)
+
+        #reconstruccion del camino
+        camino = self.camino(inicio, meta)
+        if camino is None:
+            return None, nodos_visitados, float('inf')
 
-    while pila:                                                                 #se ejecuta mientras haya nodos en la pila, si la pila esta vacia no hay mas caminos
-        actual = pila.pop()
-        nodos_visitados = nodos_visitados + 1 #afectada
+        return camino, nodos_visitados, self.costos[meta]
+
+    #dijkstra de uno a todos: el mismo ciclo de relajacion que ucs pero sin meta,
+    #al terminar se leen los costos de cualquier celda con costo_hasta()
+    def ucs_desde(self, inicio, cola='heap'):
+        _, nodos_visitados = self.dijkstra(self.indice(inicio), (), cola)
+        return nodos_visitados
+
+    def costo_hasta(self, meta):
+        meta = self.indice(meta)
+        if self.vistos[meta] != self.generacion:
+            return math.inf
+        return self.costos[meta]
+
+    #ciclo de relajacion de ucs, regresa la meta alcanzada (-1 si ninguna) y los nodos visitados
+    def dijkstra(self, inicio, metas, cola='heap'):
+        meta = -1
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+        costo_de = self.laberinto.costos
+
+        gen = self.nueva_generacion()
+        vistos = self.vistos
+        cerrados = self.cerrados
+        padre = self.padre
+        costos = self.costos
+
+        cola, meter, sacar = crear_cola(cola)
+        meter((0, inicio))
+        vistos[inicio] = gen
+        costos[inicio] = 0
+        padre[inicio] = -1
+        nodos_visitados = 0
+
+        while len(cola) > 0:
+            costo_actual, actual = sacar()
+
+            if cerrados[actual] == gen:
+                continue
 
-        if actual == meta:
-            break
+            cerrados[actual] = gen
+            nodos_visitados = nodos_visitados + 1
+
+            if actual in metas:
+                meta = actual
+                break
+
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                costo_v = costo_de[v]
+                if costo_v == COSTO_INFINITO:
+                    continue
+                nuevo_costo = costo_actual + costo_v
+
+                if vistos[v] != gen or nuevo_costo < costos[v]:
+                    vistos[v] = gen
+                    costos[v] = nuevo_costo
+                    padre[v] = actual
+                    meter((nuevo_costo, v))
+
+        return meta, nodos_visitados
+
+    #arreglos de la busqueda hacia atras (desde la meta), se crean la primera vez que se usan
+    def arreglos_atras(self):
+        if self.atras is None:
+            total = len(self.vistos)
+            self.atras = (array('I', [0]) * total, array('I', [0]) * total,
+                          array('i', [-1]) * total, array('I', [0]) * total)
+        return self.atras
+
+    #une el camino de ida (inicio -> encuentro) con el de regreso (encuentro -> meta)
+    def camino_bidireccional(self, inicio, encuentro):
+        laberinto = self.laberinto
+        camino = reconstruir_camino(laberinto, self.padre, inicio, encuentro)
+        siguiente = self.atras[2]
+        actual = siguiente[encuentro]
+        while actual != -1:
+            camino.append(laberinto.posicion(actual))
+            actual = siguiente[actual]
+        return camino
+
+    #BFS desde el inicio y desde la(s) meta(s) al mismo tiempo, se expande por capas
+    #el lado con la frontera mas chica. en la primera capa que toca al otro lado se
+    #toma el encuentro mas corto de toda la capa, eso da la misma longitud que bfs
+    def bfs_bidireccional(self, inicio=None, meta=None):
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+
+        gen = self.nueva_generacion()
+        vistos_ida, padre_ida, dist_ida = self.vistos, self.padre, self.costos
+        vistos_vuelta, _, padre_vuelta, dist_vuelta = self.arreglos_atras()
+
+        vistos_ida[inicio] = gen
+        padre_ida[inicio] = -1
+        dist_ida[inicio] = 0
+        for m in metas:
+            vistos_vuelta[m] = gen
+            padre_vuelta[m] = -1
+            dist_vuelta[m] = 0
+
+        if inicio in metas:
+            return self.camino_bidireccional(inicio, inicio), 1
+
+        frontera_ida = [inicio]
+        frontera_vuelta = list(metas)
+        nodos_visitados = 0
+        mejor = math.inf
+        encuentro = -1
+
+        while frontera_ida and frontera_vuelta:
+            if len(frontera_ida) <= len(frontera_vuelta):
+                frontera, vistos, padre, dist = frontera_ida, vistos_ida, padre_ida, dist_ida
+                otros, dist_otro = vistos_vuelta, dist_vuelta
+                hacia_adelante = True
+            else:
+                frontera, vistos, padre, dist = frontera_vuelta, vistos_vuelta, padre_vuelta, dist_vuelta
+                otros, dist_otro = vistos_ida, dist_ida
+                hacia_adelante = False
+
+            siguiente = []
+            for actual in frontera:
+                nodos_visitados = nodos_visitados + 1
+                paso = dist[actual] + 1
+                for d in salidas[mascaras[actual]]:
+                    v = actual + d
+                    if vistos[v] == gen:
+                        continue
+                    vistos[v] = gen
+                    padre[v] = actual
+                    dist[v] = paso
+                    siguiente.append(v)
+                    if otros[v] == gen and paso + dist_otro[v] < mejor:
+                        mejor = paso + dist_otro[v]
+                        encuentro = v
+
+            if hacia_adelante:
+                frontera_ida = siguiente
+            else:
+                frontera_vuelta = siguiente
 
-        for v in vecinos(laberinto, actual):
-            if v not in visitados:
-                visitados.add(v)
-                padre[v] = actual
-                pila.append(v)
+            if encuentro != -1:
+                break
 
-    # Reconstrucción del camino
-    camino = []
-    actual = meta
-    while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
+        if encuentro == -1:
             return None, nodos_visitados
-    camino.append(inicio)
-    camino.reverse()
-
-    return camino, nodos_visitados
+        return self.camino_bidireccional(inicio, encuentro), nodos_visitados
+
+    #Dijkstra desde el inicio y hacia atras desde la(s) meta(s). el costo de una arista es el
+    #de la celda a la que se entra, asi que hacia atras de v a u se suma el costo de v.
+    #mejor guarda el camino mas barato que ya une los dos lados, y se para cuando
+    #el tope de las dos colas ya no puede mejorarlo
+    def ucs_bidireccional(self, inicio=None, meta=None):
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        mascaras = self.laberinto.mascaras
+        salidas = self.laberinto.salidas
+        costo_de = self.laberinto.costos
+
+        gen = self.nueva_generacion()
+        vistos_ida, cerrados_ida, padre_ida, costos_ida = self.vistos, self.cerrados, self.padre, self.costos
+        vistos_vuelta, cerrados_vuelta, padre_vuelta, costos_vuelta = self.arreglos_atras()
+
+        vistos_ida[inicio] = gen
+        padre_ida[inicio] = -1
+        costos_ida[inicio] = 0
+        cola_ida = [(0, inicio)]
+        cola_vuelta = []
+        for m in sorted(metas):
+            vistos_vuelta[m] = gen
+            padre_vuelta[m] = -1
+            costos_vuelta[m] = 0
+            cola_vuelta.append((0, m))
+
+        mejor = math.inf
+        encuentro = -1
+        if inicio in metas:
+            mejor = 0
+            encuentro = inicio
+        nodos_visitados = 0
+
+        while cola_ida and cola_vuelta:
+            if cola_ida[0][0] + cola_vuelta[0][0] >= mejor:
+                break
+
+            if cola_ida[0][0] <= cola_vuelta[0][0]:
+                costo_actual, actual = heapq.heappop(cola_ida)
+                if cerrados_ida[actual] == gen:
+                    continue
+                cerrados_ida[actual] = gen
+                nodos_visitados = nodos_visitados + 1
+
+                for d in salidas[mascaras[actual]]:
+                    v = actual + d
+                    costo_v = costo_de[v]
+                    if costo_v == COSTO_INFINITO:
+                        continue
+                    nuevo_costo = costo_actual + costo_v
+                    if vistos_ida[v] != gen or nuevo_costo < costos_ida[v]:
+                        vistos_ida[v] = gen
+                        costos_ida[v] = nuevo_costo
+                        padre_ida[v] = actual
+                        heapq.heappush(cola_ida, (nuevo_costo, v))
+                        if vistos_vuelta[v] == gen and nuevo_costo + costos_vuelta[v] < mejor:
+                            mejor = nuevo_costo + costos_vuelta[v]
+                            encuentro = v
+            else:
+                costo_actual, actual = heapq.heappop(cola_vuelta)
+                if cerrados_vuelta[actual] == gen:
+                    continue
+                cerrados_vuelta[actual] = gen
+                nodos_visitados = nodos_visitados + 1
+
+                costo_entrar = costo_de[actual]
+                if costo_entrar == COSTO_INFINITO:
+                    continue
+                nuevo_costo = costo_actual + costo_entrar
+                for d in salidas[mascaras[actual]]:
+                    u = actual + d
+                    if vistos_vuelta[u] != gen or nuevo_costo < costos_vuelta[u]:
+                        vistos_vuelta[u] = gen
+                        costos_vuelta[u] = nuevo_costo
+                        padre_vuelta[u] = actual
+                        heapq.heappush(cola_vuelta, (nuevo_costo, u))
+                        if vistos_ida[u] == gen and costos_ida[u] + nuevo_costo < mejor:
+                            mejor = costos_ida[u] + nuevo_costo
+                            encuentro = u
+
+        if encuentro == -1:
+            return None, nodos_visitados, float('inf')
+        return self.camino_bidireccional(inicio, encuentro), nodos_visitados, mejor
+
+    #Algoritmo de A*
+    #observador es opcional, se llama como observador(laberinto, abiertos, cerrados, camino_parcial)
+    #cada N expansiones (cada=0 solo al final), por ejemplo mostrar_laberinto_aestrella.
+    #si el observador tiene por_cambios = True (AnimacionTerminal) abiertos y cerrados son solo
+    #los nodos que se metieron a la cola y los que se cerraron desde el aviso anterior
+    #cola='cubetas' usa la cola de Dial, solo con heuristicas enteras como la Manhattan
+    #con peso > 1 es A* ponderado: f = g + peso * h, con h bajada un paso (entrar a 'G' cuesta 0)
+    #para que sea admisible; el costo que regresa es a lo mucho peso veces el optimo y expande
+    #menos nodos entre mas grande es el peso. peso=1 es el A* de siempre
+    def astar(self, heuristica, inicio=None, meta=None, observador=None, cada=1, cola='heap', peso=1):
+        laberinto = self.laberinto
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        meta = -1
+        metas_pos = [laberinto.posicion(m) for m in metas]
+        meta_pos = metas_pos[0]
+        una_meta = len(metas_pos) == 1
+        mascaras = laberinto.mascaras
+        salidas = laberinto.salidas
+        costo_de = laberinto.costos
+
+        gen = self.nueva_generacion()
+        vistos = self.vistos
+        cerrados = self.cerrados
+        padre = self.padre
+        g_costos = self.costos
+
+        if cola == 'cubetas' and not (isinstance(heuristica(laberinto.posicion(inicio), meta_pos), int) and isinstance(peso, int)):
+            raise ValueError("La cola de cubetas necesita una heuristica y un peso enteros")
+        if peso < 1:
+            raise ValueError("El peso de A* tiene que ser al menos 1")
+        abiertos, meter, sacar = crear_cola(cola)
+        f_inicial = 0
+        elemento = (f_inicial, inicio)
+        meter(elemento)
+
+        vistos[inicio] = gen
+        g_costos[inicio] = 0
+        padre[inicio] = -1
+        nodos_visitados = 0
+        actual = inicio
+        ultimo_notificado = -1
+        expandidos = [] #nodos cerrados en orden, solo se llena si hay observador
+        por_cambios = observador is not None and getattr(observador, 'por_cambios', False)
+        if por_cambios:
+            #se envuelve meter para anotar los nodos nuevos en la cola, asi el ciclo queda igual
+            metidos = []
+            meter_cola = meter
+            def meter(elemento):
+                metidos.append(elemento[1])
+                meter_cola(elemento)
+            metidos.append(inicio)
+
+        while len(abiertos) > 0:
+            elemento = sacar()
+            actual = elemento[1]
+
+
+            if cerrados[actual] == gen:
+                continue
 
+            cerrados[actual] = gen
+            nodos_visitados = nodos_visitados + 1
+
+            #la visualizacion solo se arma cuando hay observador y toca muestra,
+            #sin observador el ciclo no hace nada extra
+            if observador is not None:
+                expandidos.append(actual)
+                if cada and nodos_visitados % cada == 0:
+                    if por_cambios:
+                        observador(laberinto, metidos, expandidos, self.camino_parcial(inicio, actual))
+                        metidos = []
+                        expandidos = []
+                    else:
+                        self.notificar(observador, inicio, actual, abiertos, expandidos)
+                    ultimo_notificado = nodos_visitados
+
+            if actual in metas:
+                meta = actual
+                break
+            
+            #metodo de relajación, si se llego a este nodo, y el nuevo camino es más barato, se toma ese
+            for d in salidas[mascaras[actual]]:
+                v = actual + d
+                costo_v = costo_de[v]
+                if costo_v == COSTO_INFINITO:
+                    continue
+                nuevo_g = g_costos[actual] + costo_v
+
+                ya_esta_cerrado = cerrados[v] == gen #ya fue evaluado el nodo se usara como if para continuar con el algoritmo
+                costo_guardado = g_costos[v] if vistos[v] == gen else math.inf
+                costo_nuevo = nuevo_g
+                
+                if ya_esta_cerrado and costo_nuevo >= costo_guardado:
+                    continue
+                #A* ponderado no reabre: con h consistente la cota de peso veces el optimo se
+                #mantiene, y el camino por los padres siempre cuesta lo que dice g de la meta
+                if ya_esta_cerrado and peso != 1:
+                    continue
+                    
+                #se actualiza la información de las variables gracias al metodo de relajacion
+                costo_anterior = costo_guardado
+                costo_nuevo = nuevo_g
+                
+                if nuevo_g < costo_anterior:
+                    #se guarda de donde viene el nodo o actualiza
+                    padre[v] = actual
+                    #Se actualiza el mejor costo conocido
+                    vistos[v] = gen
+                    g_costos[v] = costo_nuevo
+                    #se recalcula la heuristica, las heuristicas siguen recibiendo coordenadas
+                    pos_v = laberinto.posicion(v)
+                    if una_meta:
+                        costo_estimado = heuristica(pos_v, meta_pos)
+                    else:
+                        #con varias metas se estima hacia la mas cercana
+                        costo_estimado = min(heuristica(pos_v, m) for m in metas_pos)
+                    if peso != 1:
+                        costo_estimado = peso * max(costo_estimado - 1, 0)
+                    f = costo_nuevo + costo_estimado
+                    meter((f,v))
+                    
+
+        #el estado final siempre se manda, si no se mando ya en el ultimo paso
+        if observador is not None and ultimo_notificado != nodos_visitados:
+            if por_cambios:
+                observador(laberinto, metidos, expandidos, self.camino_parcial(inicio, actual))
+            else:
+                self.notificar(observador, inicio, actual, abiertos, expandidos)
 
-#algoritmo de costos uniformes
-def ucs(laberinto):
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
+        # Reconstrucción del camino, es la misma que ucs
+        camino = self.camino(inicio, meta)
+        if camino is None:
+            return None, nodos_visitados, float('inf')
 
-    cola = []
-    heapq.heappush(cola, (0, inicio))
+        return camino, nodos_visitados, g_costos[meta]
+
+    #A* anytime (ARA*): empieza con A* ponderado con peso alto para tener un camino rapido y va
+    #bajando el peso de paso en paso hasta 1, reusando lo que ya busco: las celdas que mejoran
+    #despues de cerradas se guardan en incons y vuelven a abiertos en la siguiente vuelta en lugar
+    #de reabrirse. es un generador, cada vuelta que mejora el camino da (camino, nodos, costo, cota)
+    #donde cota es cuantas veces el optimo puede ser el costo a lo mucho (1 es optimo) y nodos es
+    #el total de expansiones hasta ahi. con tiempo (segundos) deja de mejorar cuando se acaba,
+    #pero el primer camino siempre se busca completo. usa diccionarios propios y no los arreglos
+    #del Solver, asi se pueden hacer otras busquedas mientras el generador sigue vivo
+    def ara(self, heuristica, inicio=None, meta=None, peso=3, paso=0.5, tiempo=None):
+        laberinto = self.laberinto
+        inicio, metas = self.extremos(inicio, meta)
+        if peso < 1 or paso <= 0:
+            raise ValueError("ARA* necesita un peso de al menos 1 y un paso positivo")
+        if self.sin_conexion(inicio, metas):
+            yield None, 0, float('inf'), 1
+            return
+        h = self.heuristica_admisible(heuristica, metas)
+        mascaras = laberinto.mascaras
+        salidas = laberinto.salidas
+        costo_de = laberinto.costos
+        limite_tiempo = None if tiempo is None else time.perf_counter() + tiempo
+
+        g = {inicio: 0}
+        padre = {inicio: -1}
+        estimado = {inicio: h(inicio)}
+        abiertos = [(peso * estimado[inicio], inicio)]
+        cerrados = set()
+        incons = set()
+        nodos_visitados = 0
+        meta = -1
+        costo_meta = math.inf
+        primera = True
+
+        while True:
+            completa = True
+            #se expande mientras haya algo abierto con f menor al costo de la mejor meta
+            while abiertos and abiertos[0][0] < costo_meta:
+                f, actual = heapq.heappop(abiertos)
+                if actual in cerrados or f != g[actual] + peso * estimado[actual]:
+                    continue
+                cerrados.add(actual)
+                nodos_visitados = nodos_visitados + 1
+                if actual in metas:
+                    meta = actual
+                    costo_meta = g[actual]
+                    continue
+                if not primera and limite_tiempo is not None and nodos_visitados % 1024 == 0 and time.perf_counter() > limite_tiempo:
+                    completa = False
+                    break
+                for d in salidas[mascaras[actual]]:
+                    v = actual + d
+                    costo_v = costo_de[v]
+                    if costo_v == COSTO_INFINITO:
+                        continue
+                    nuevo_g = g[actual] + costo_v
+                    if nuevo_g >= g.get(v, math.inf):
+                        continue
+                    g[v] = nuevo_g
+                    padre[v] = actual
+                    if v not in estimado:
+                        estimado[v] = h(v)
+                    #con peso 1 se reabre como en astar para que el ultimo camino sea optimo
+                    if v in cerrados and peso > 1:
+                        incons.add(v)
+                    else:
+                        cerrados.discard(v)
+                        heapq.heappush(abiertos, (nuevo_g + peso * estimado[v], v))
+            if not completa:
+                return
+            primera = False
+
+            #cota = costo / (menor g + h de lo que falta por revisar), nunca mayor al peso
+            menor = min([g[c] + estimado[c] for _, c in abiertos if c not in cerrados] +
+                        [g[c] + estimado[c] for c in incons], default=math.inf)
+            if meta == -1:
+                yield None, nodos_visitados, float('inf'), 1
+                return
+            #los padres de celdas en incons ya mejoraron, el camino que dan puede costar menos que
+            #g de la meta; se reporta lo que cuesta de verdad (la cota sigue valiendo)
+            costo = 0
+            celda = meta
+            while celda != inicio:
+                costo = costo + costo_de[celda]
+                celda = padre[celda]
+            costo_meta = min(costo_meta, costo)
+            cota = 1 if costo_meta <= menor else min(peso, costo_meta / menor)
+            camino = reconstruir_camino(laberinto, padre, inicio, meta)
+            yield camino, nodos_visitados, costo_meta, cota
+            if cota <= 1 or (limite_tiempo is not None and time.perf_counter() > limite_tiempo):
+                return
+
+            #siguiente vuelta: peso mas chico, incons regresa a abiertos y cerrados se vacia
+            peso = max(1, peso - paso)
+            vivos = {c for _, c in abiertos if c not in cerrados} | incons
+            abiertos = [(g[c] + peso * estimado[c], c) for c in vivos]
+            heapq.heapify(abiertos)
+            incons = set()
+            cerrados = set()
+
+    #heuristica hacia la meta mas cercana, bajada un paso (entrar a 'G' cuesta 0) para que sea admisible,
+    #la usan las busquedas con memoria limitada que no reabren nodos como astar
+    def heuristica_admisible(self, heuristica, metas):
+        laberinto = self.laberinto
+        metas_pos = [laberinto.posicion(m) for m in metas]
+
+        def h(celda):
+            pos = laberinto.posicion(celda)
+            return max(min(heuristica(pos, m) for m in metas_pos) - 1, 0)
+        return h
+
+    #IDA*: busqueda en profundidad con un limite de f = g + h que sube en cada iteracion al menor f
+    #que se paso del limite. solo guarda el camino actual (una pila de iteradores de vecinos),
+    #asi la memoria depende del largo del camino y no del area explorada. a cambio vuelve a
+    #expandir celdas en cada iteracion y por caminos distintos; para no explotar en cuartos abiertos
+    #se guarda el menor g de hasta max_nodos celdas por iteracion y se corta si se llega con g igual
+    #o mayor (max_nodos=0 es IDA* puro, sin esa tabla)
+    def ida(self, heuristica, inicio=None, meta=None, max_nodos=100000):
+        laberinto = self.laberinto
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        h = self.heuristica_admisible(heuristica, metas)
+        mascaras = laberinto.mascaras
+        salidas = laberinto.salidas
+        costo_de = laberinto.costos
+        nodos_visitados = 1
+        if inicio in metas:
+            return [laberinto.posicion(inicio)], nodos_visitados, 0
+
+        #los vecinos se recorren del menor al mayor f, asi la primera vez que se llega a una celda
+        #suele ser ya con su mejor g y la tabla corta mas ramas
+        def hijos(celda, g):
+            candidatos = []
+            for d in salidas[mascaras[celda]]:
+                v = celda + d
+                costo_v = costo_de[v]
+                if costo_v != COSTO_INFINITO:
+                    candidatos.append((g + costo_v + h(v), g + costo_v, v))
+            candidatos.sort()
+            return iter(candidatos)
+
+        limite = h(inicio)
+        while True:
+            siguiente_limite = math.inf
+            pila = [(inicio, 0, hijos(inicio, 0))]
+            en_camino = {inicio}
+            mejor_g = {inicio: 0}
+            while pila:
+                actual, g, pendientes = pila[-1]
+                siguiente = next(pendientes, None)
+                if siguiente is None:
+                    pila.pop()
+                    en_camino.discard(actual)
+                    continue
+                f, g_v, v = siguiente
+                if v in en_camino or mejor_g.get(v, math.inf) <= g_v:
+                    continue
+                if f > limite:
+                    if f < siguiente_limite:
+                        siguiente_limite = f
+                    continue
+                if v in mejor_g or len(mejor_g) < max_nodos:
+                    mejor_g[v] = g_v
+                nodos_visitados = nodos_visitados + 1
+                if v in metas:
+                    camino = [laberinto.posicion(celda) for celda, _, _ in pila]
+                    camino.append(laberinto.posicion(v))
+                    return camino, nodos_visitados, g_v
+                pila.append((v, g_v, hijos(v, g_v)))
+                en_camino.add(v)
+            if siguiente_limite == math.inf:
+                return None, nodos_visitados, float('inf')
+            limite = siguiente_limite
+
+    #A* con memoria limitada (SMA* simplificado): a lo mucho max_nodos nodos guardados (mas los
+    #vecinos recien generados, que no se olvidan en la misma vuelta para que la busqueda avance).
+    #como en SMA* original es una busqueda en arbol: cada nodo tiene su propio numero y guarda
+    #[celda, g, f, padre, hijos guardados, menor f de los hijos olvidados, profundidad]; una celda
+    #solo se vuelve a generar si no hay otro nodo guardado que llegue a ella con g menor o igual.
+    #cuando se llena se olvida la hoja abierta con mayor f (la menos profunda si empatan) y su f
+    #queda en el padre, que vuelve a abiertos con ese f para regenerarla mas adelante. f usa pathmax
+    #(nunca baja de padre a hijo). un nodo que no es meta a profundidad max_nodos - 1 ya no se puede
+    #extender sin pasarse de memoria y su f es infinito; si el mejor abierto tiene f infinito el
+    #camino no cabe en max_nodos y regresa None. con max_nodos muy por debajo de lo que guardaria
+    #astar se vuelven a generar los mismos nodos una y otra vez; max_expansiones corta la busqueda
+    #(y regresa None) si se pasa de ese numero de nodos expandidos. sin max_expansiones el tope es
+    #EXPANSIONES_SMA_POR_CELDA por cada celda del laberinto
+    def sma(self, heuristica, inicio=None, meta=None, max_nodos=100000, max_expansiones=None):
+        laberinto = self.laberinto
+        if max_expansiones is None:
+            max_expansiones = EXPANSIONES_SMA_POR_CELDA * laberinto.ancho * laberinto.alto
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        h = self.heuristica_admisible(heuristica, metas)
+        mascaras = laberinto.mascaras
+        salidas = laberinto.salidas
+        costo_de = laberinto.costos
+        CELDA, G, F, PADRE, HIJOS, OLVIDADO, PROFUNDIDAD = range(7)
+
+        nodos = {0: [inicio, 0, h(inicio), -1, 0, math.inf, 0]}
+        mejor = {inicio: 0}                #celda -> nodo guardado con menor g
+        en_abiertos = {0}
+        abiertos = [(nodos[0][F], 0, 0)]   #menor f primero, y el mas profundo si empatan
+        peores = [(-nodos[0][F], 0, 0)]    #mayor f primero, y el menos profundo si empatan
+        siguiente_id = 1
+        nodos_visitados = 0
+
+        def abrir(numero):
+            nodo = nodos[numero]
+            en_abiertos.add(numero)
+            heapq.heappush(abiertos, (nodo[F], -nodo[PROFUNDIDAD], numero))
+            heapq.heappush(peores, (-nodo[F], nodo[PROFUNDIDAD], numero))
+
+        def quitar(numero):
+            #saca un nodo sin hijos de la memoria, regresa a su padre
+            nodo = nodos.pop(numero)
+            en_abiertos.discard(numero)
+            if mejor.get(nodo[CELDA]) == numero:
+                del mejor[nodo[CELDA]]
+            if nodo[PADRE] != -1:
+                nodos[nodo[PADRE]][HIJOS] -= 1
+            return nodo[PADRE]
+
+        while en_abiertos:
+            f, _, actual = heapq.heappop(abiertos)
+            nodo = nodos.get(actual)
+            if actual not in en_abiertos or nodo[F] != f:
+                continue
+            if f == math.inf or nodos_visitados >= max_expansiones:
+                break
+            en_abiertos.discard(actual)
+            nodos_visitados = nodos_visitados + 1
+            celda = nodo[CELDA]
+
+            if celda in metas:
+                camino = []
+                numero = actual
+                while numero != -1:
+                    camino.append(laberinto.posicion(nodos[numero][CELDA]))
+                    numero = nodos[numero][PADRE]
+                camino.reverse()
+                return camino, nodos_visitados, nodo[G]
+
+            nodo[OLVIDADO] = math.inf
+            nuevos = []
+            for d in salidas[mascaras[celda]]:
+                v = celda + d
+                costo_v = costo_de[v]
+                if costo_v == COSTO_INFINITO:
+                    continue
+                g_v = nodo[G] + costo_v
+                otro = mejor.get(v)
+                if otro is not None and nodos[otro][G] <= g_v:
+                    continue
+                profundidad = nodo[PROFUNDIDAD] + 1
+                if v not in metas and profundidad >= max_nodos - 1:
+                    f_v = math.inf
+                else:
+                    f_v = max(nodo[F], g_v + h(v))
+                nodos[siguiente_id] = [v, g_v, f_v, actual, 0, math.inf, profundidad]
+                mejor[v] = siguiente_id
+                nodo[HIJOS] += 1
+                abrir(siguiente_id)
+                nuevos.append(siguiente_id)
+                siguiente_id += 1
+
+            #callejon sin salida: se quita, y tambien los ancestros que se queden sin nada abajo
+            numero = actual
+            while numero > 0 and numero not in en_abiertos and nodos[numero][HIJOS] == 0:
+                numero = quitar(numero)
+
+            olvidables = []
+            while len(nodos) > max_nodos and peores:
+                menos_f, profundidad, numero = heapq.heappop(peores)
+                peor = nodos.get(numero)
+                if numero not in en_abiertos or peor[F] != -menos_f:
+                    continue
+                if peor[HIJOS] or numero == 0 or numero in nuevos:
+                    olvidables.append((menos_f, profundidad, numero))
+                    continue
+                #el padre vuelve a abiertos con el f del hijo olvidado para poder regenerarlo
+                padre = quitar(numero)
+                nodo_padre = nodos[padre]
+                nodo_padre[OLVIDADO] = min(nodo_padre[OLVIDADO], -menos_f)
+                if padre not in en_abiertos or nodo_padre[OLVIDADO] < nodo_padre[F]:
+                    nodo_padre[F] = nodo_padre[OLVIDADO]
+                    abrir(padre)
+            for entrada in olvidables:
+                heapq.heappush(peores, entrada)
+
+            #las colas tienen entradas viejas, se rehacen para que tampoco pasen del limite
+            if len(abiertos) > 2 * max_nodos + 16:
+                abiertos = [(nodos[n][F], -nodos[n][PROFUNDIDAD], n) for n in en_abiertos]
+                heapq.heapify(abiertos)
+                peores = [(-nodos[n][F], nodos[n][PROFUNDIDAD], n) for n in en_abiertos]
+                heapq.heapify(peores)
+
+        return None, nodos_visitados, float('inf')
+
+    #arma el estado de A* que recibe el observador: nodos abiertos, cerrados y el camino parcial al nodo actual
+    def notificar(self, observador, inicio, actual, abiertos, expandidos):
+        camino_parcial = self.camino_parcial(inicio, actual)
 
-    costos = {inicio: 0}
-    padre = {}
-    visitados = set()
-    nodos_visitados = 0
+        nodo_abiertos = []
+        for elemento in abiertos:
+            nodo = elemento[1]
+            nodo_abiertos.append(nodo)
 
-    while len(cola) > 0:
-        costo_actual, actual = heapq.heappop(cola)
+        observador(self.laberinto, nodo_abiertos, expandidos, camino_parcial)
 
-        if actual in visitados:
-            continue
+    #nodos del camino de actual hacia atras hasta inicio (sin incluirlo), siguiendo los padres
+    def camino_parcial(self, inicio, actual):
+        padre = self.padre
+        camino_parcial = []
+        aux = actual
+        while aux != inicio:
+            camino_parcial.append(aux)
+            aux = padre[aux]
+        return camino_parcial
+
+    #tablas de JPS de una fila, se arman la primera vez que un salto pasa por ella y se guardan:
+    #- uniformes: 1 si la celda y todos sus vecinos transitables cuestan lo mismo
+    #- derecha/izquierda: a donde llega un salto horizontal que sale de una celda uniforme,
+    #  la columna del punto de salto, o -1 - ultima_columna si se topa con pared antes
+    def fila_jps(self, fila):
+        tabla = self.tablas_jps.get(fila)
+        if tabla is not None:
+            return tabla
+
+        laberinto = self.laberinto
+        mascaras = laberinto.mascaras
+        salidas = laberinto.salidas
+        costo_de = laberinto.costos
+        ancho = laberinto.ancho
+        base = fila * laberinto.paso_fila
+
+        uniformes = bytearray(ancho)
+        for j in range(ancho):
+            celda = base + j
+            c = costo_de[celda]
+            if c == COSTO_INFINITO or laberinto.celdas[celda] == PARED:
+                continue
+            for d in salidas[mascaras[celda]]:
+                if costo_de[celda + d] != c:
+                    break
+            else:
+                uniformes[j] = 1
+
+        derecha = array('i', [0]) * ancho
+        izquierda = array('i', [0]) * ancho
+        for tabla, bit, dx, columnas in ((derecha, DERECHA, 1, range(ancho - 1, -1, -1)),
+                                         (izquierda, IZQUIERDA, -1, range(ancho))):
+            for j in columnas:
+                celda = base + j
+                if not mascaras[celda] & bit or costo_de[celda + dx] == COSTO_INFINITO:
+                    tabla[j] = -1 - j
+                    continue
+                y = j + dx
+                m_y = mascaras[celda + dx]
+                m_x = mascaras[celda]
+                #vecino forzado: arriba o abajo se abre justo en y
+                if (not uniformes[y] or (m_y & ARRIBA and not m_x & ARRIBA)
+                        or (m_y & ABAJO and not m_x & ABAJO)):
+                    tabla[j] = y
+                else:
+                    tabla[j] = tabla[y]
+
+        tabla = (uniformes, derecha, izquierda)
+        self.tablas_jps[fila] = tabla
+        return tabla
+
+    #tablas de JPS de una columna, como las de fila_jps pero para los saltos verticales:
+    #abajo/arriba[fila] es la fila donde se detiene un salto que sale de esa celda, la primera
+    #celda no uniforme o desde la que un salto horizontal (sin contar metas) llega a un punto de
+    #salto, o -1 - ultima_fila si se topa con pared antes. asi un salto vertical ya no revisa
+    #los lados celda por celda
+    def columna_jps(self, columna):
+        tabla = self.columnas_jps.get(columna)
+        if tabla is not None:
+            return tabla
+
+        laberinto = self.laberinto
+        mascaras = laberinto.mascaras
+        costo_de = laberinto.costos
+        paso_fila = laberinto.paso_fila
+        alto = laberinto.alto
+
+        #1 si desde esa fila hay que detenerse: celda no uniforme o con salto horizontal que llega
+        parada = bytearray(alto)
+        for fila in range(alto):
+            uniformes, derecha, izquierda = self.fila_jps(fila)
+            if not uniformes[columna] or derecha[columna] >= 0 or izquierda[columna] >= 0:
+                parada[fila] = 1
+
+        abajo = array('i', [0]) * alto
+        arriba = array('i', [0]) * alto
+        for tabla, bit, dy, filas in ((abajo, ABAJO, 1, range(alto - 1, -1, -1)),
+                                      (arriba, ARRIBA, -1, range(alto))):
+            paso = dy * paso_fila
+            for fila in filas:
+                celda = fila * paso_fila + columna
+                if not mascaras[celda] & bit or costo_de[celda + paso] == COSTO_INFINITO:
+                    tabla[fila] = -1 - fila
+                    continue
+                y = fila + dy
+                tabla[fila] = y if parada[y] else tabla[y]
+
+        tabla = (abajo, arriba)
+        self.columnas_jps[columna] = tabla
+        return tabla
+
+    #las marcas de celda uniforme de fila_jps para toda la rejilla, indexadas por celda
+    def celdas_uniformes(self):
+        if self.uniformes_jps is None:
+            laberinto = self.laberinto
+            uniformes = bytearray(len(laberinto.celdas))
+            for fila in range(laberinto.alto):
+                base = fila * laberinto.paso_fila
+                uniformes[base:base + laberinto.ancho] = self.fila_jps(fila)[0]
+            self.uniformes_jps = uniformes
+        return self.uniformes_jps
+
+    #las celdas uniformes que estan en un bloque con al menos FRACCION_UNIFORME_JPS de celdas
+    #libres uniformes; desde las demas JPS no salta y expande sus vecinos como astar
+    def celdas_de_salto(self):
+        if self.saltos_jps is None:
+            laberinto = self.laberinto
+            uniformes = self.celdas_uniformes()
+            costo_de = laberinto.costos
+            saltos = bytearray(uniformes)
+            for fila_bloque in range(0, laberinto.alto, BLOQUE_JPS):
+                filas = range(fila_bloque, min(fila_bloque + BLOQUE_JPS, laberinto.alto))
+                for columna in range(0, laberinto.ancho, BLOQUE_JPS):
+                    fin = min(columna + BLOQUE_JPS, laberinto.ancho)
+                    tramos = [(fila * laberinto.paso_fila + columna, fila * laberinto.paso_fila + fin) for fila in filas]
+                    libres = sum(b - a - costo_de[a:b].count(COSTO_INFINITO) for a, b in tramos)
+                    if sum(uniformes[a:b].count(1) for a, b in tramos) < FRACCION_UNIFORME_JPS * libres:
+                        for a, b in tramos:
+                            saltos[a:b] = bytes(b - a)
+            self.saltos_jps = saltos
+        return self.saltos_jps
+
+    #Jump Point Search con movimiento en 4 direcciones. los movimientos verticales hacen el papel
+    #de las diagonales del JPS normal: en cada paso vertical se revisa hacia los lados, y los
+    #horizontales solo dan vuelta en vecinos forzados (donde se acaba una pared de arriba o abajo).
+    #los costos solo son simetricos dentro de una zona del mismo costo, asi que un salto tambien
+    #se detiene en cualquier celda que tenga un vecino de otro costo, y esas se expanden completas.
+    #los saltos salen de las tablas de fila_jps y columna_jps en O(1) (mas una revision por meta).
+    #en los bloques con muchos terrenos mezclados casi no hay saltos largos y sus celdas se
+    #expanden como en astar, ver FRACCION_UNIFORME_JPS. en campo abierto muchos puntos de salto
+    #tienen el mismo f, con empate se saca primero el de mayor g (el mas cerca de la meta)
+    def jps(self, heuristica=None, inicio=None, meta=None):
+        if heuristica is None:
+            heuristica = heuristica_manhattan
+        uniformes_celda = self.celdas_uniformes()
+        saltos_celda = self.celdas_de_salto()
+        laberinto = self.laberinto
+        inicio, metas = self.extremos(inicio, meta)
+        if self.sin_conexion(inicio, metas):
+            return None, 0, float('inf')
+        meta = -1
+        metas_pos = [laberinto.posicion(m) for m in metas]
+        mascaras = laberinto.mascaras
+        costo_de = laberinto.costos
+        paso_fila = laberinto.paso_fila
+        fila_jps = self.fila_jps
+        columna_jps = self.columna_jps
+
+        metas_por_fila = {}
+        for fila, columna in metas_pos:
+            metas_por_fila.setdefault(fila, []).append(columna)
+
+        salidas = laberinto.salidas
+        meta_pos = metas_pos[0]
+        una_meta = len(metas_pos) == 1
+
+        def saltar_horizontal(x, dx, g):
+            fila, columna = divmod(x, paso_fila)
+            uniformes, derecha, izquierda = fila_jps(fila)
+            tabla = derecha if dx == 1 else izquierda
+            if uniformes[columna]:
+                llegada = tabla[columna]
+            else:
+                #la celda de partida no es uniforme, el primer paso se revisa a mano
+                bit = DERECHA if dx == 1 else IZQUIERDA
+                if not mascaras[x] & bit or costo_de[x + dx] == COSTO_INFINITO:
+                    return -1, 0
+                y = columna + dx
+                if not uniformes[y] or mascaras[x + dx] & (ARRIBA | ABAJO):
+                    llegada = y
+                else:
+                    llegada = tabla[y]
+            if llegada == -1 - columna:
+                return -1, 0
+            c = costo_de[x + dx] #todas las celdas del salto cuestan lo mismo
+
+            #si alguna meta queda en el tramo, el salto termina ahi
+            fin = llegada if llegada >= 0 else -1 - llegada
+            metas_fila = metas_por_fila.get(fila)
+            if metas_fila:
+                mas_cerca = None
+                for m in metas_fila:
+                    if (m - columna) * dx > 0 and (fin - m) * dx >= 0:
+                        if mas_cerca is None or abs(m - columna) < abs(mas_cerca - columna):
+                            mas_cerca = m
+                if mas_cerca is not None:
+                    return fila * paso_fila + mas_cerca, g + abs(mas_cerca - columna) * c
+
+            if llegada < 0:
+                return -1, 0
+            return fila * paso_fila + llegada, g + abs(llegada - columna) * c
+
+        #como en las diagonales, una celda del salto vertical es punto de salto si algun salto a los
+        #lados encuentra algo; eso ya esta en columna_jps salvo las metas, que se revisan aparte
+        def saltar_vertical(x, dy, g):
+            fila, columna = divmod(x, paso_fila)
+            abajo, arriba = columna_jps(columna)
+            llegada = (abajo if dy == 1 else arriba)[fila]
+            if llegada == -1 - fila:
+                return -1, 0
+            c = costo_de[x + dy * paso_fila] #todas las celdas del salto cuestan lo mismo
+            fin = llegada if llegada >= 0 else -1 - llegada
+
+            #una meta en la columna, o al alcance de un salto horizontal desde alguna fila del tramo
+            mas_cerca = None
+            for meta_fila, meta_columna in metas_pos:
+                if (meta_fila - fila) * dy <= 0 or (fin - meta_fila) * dy < 0:
+                    continue
+                if mas_cerca is not None and abs(meta_fila - fila) >= abs(mas_cerca - fila):
+                    continue
+                if meta_columna != columna:
+                    uniformes, derecha, izquierda = fila_jps(meta_fila)
+                    if not uniformes[columna]:
+                        continue
+                    dx = 1 if meta_columna > columna else -1
+                    tope = (derecha if dx == 1 else izquierda)[columna]
+                    tope = tope if tope >= 0 else -1 - tope
+                    if (tope - meta_columna) * dx < 0:
+                        continue
+                mas_cerca = meta_fila
+            if mas_cerca is not None:
+                return mas_cerca * paso_fila + columna, g + abs(mas_cerca - fila) * c
+
+            if llegada < 0:
+                return -1, 0
+            return llegada * paso_fila + columna, g + abs(llegada - fila) * c
+
+        gen = self.nueva_generacion()
+        vistos = self.vistos
+        cerrados = self.cerrados
+        padre = self.padre
+        g_costos = self.costos
+
+        abiertos = [(0, 0, inicio)]
+        vistos[inicio] = gen
+        g_costos[inicio] = 0
+        padre[inicio] = -1
+        nodos_visitados = 0
+
+        while abiertos:
+            _, _, actual = heapq.heappop(abiertos)
+            if cerrados[actual] == gen:
+                continue
+            cerrados[actual] = gen
+            nodos_visitados = nodos_visitados + 1
+
+            if actual in metas:
+                meta = actual
+                break
+
+            g_actual = g_costos[actual]
+            anterior = padre[actual]
+            if not saltos_celda[actual]:
+                #en una celda no uniforme no hay simetria que aprovechar, y en un bloque casi sin
+                #celdas uniformes los saltos no rinden: se expande como en astar
+                saltos = []
+                for d in salidas[mascaras[actual]]:
+                    v = actual + d
+                    if costo_de[v] != COSTO_INFINITO:
+                        saltos.append((v, g_actual + costo_de[v]))
+            else:
+                saltos = None
+
+            #direcciones a explorar segun como se llego a este punto
+            if saltos is not None:
+                direcciones = ()
+            elif anterior == -1:
+                direcciones = ((0, 1), (0, -1), (1, 1), (1, -1))
+            elif abs(actual - anterior) < paso_fila:
+                dx = 1 if actual > anterior else -1
+                direcciones = [(0, dx)]
+                m_actual = mascaras[actual]
+                #si la celda de atras no es uniforme sus vecinos no cuentan como atajo equivalente
+                m_atras = mascaras[actual - dx] if uniformes_celda[actual - dx] else 0
+                if m_actual & ARRIBA and not m_atras & ARRIBA:
+                    direcciones.append((1, -1))
+                if m_actual & ABAJO and not m_atras & ABAJO:
+                    direcciones.append((1, 1))
+            else:
+                dy = 1 if actual > anterior else -1
+                direcciones = ((1, dy), (0, 1), (0, -1))
+
+            if saltos is None:
+                saltos = []
+                for vertical, sentido in direcciones:
+                    if vertical:
+                        saltos.append(saltar_vertical(actual, sentido, g_actual))
+                    else:
+                        saltos.append(saltar_horizontal(actual, sentido, g_actual))
+            for v, nuevo_g in saltos:
+                if v == -1 or cerrados[v] == gen:
+                    continue
+                if vistos[v] != gen or nuevo_g < g_costos[v]:
+                    vistos[v] = gen
+                    g_costos[v] = nuevo_g
+                    padre[v] = actual
+                    pos_v = divmod(v, paso_fila)
+                    if una_meta:
+                        f = nuevo_g + heuristica(pos_v, meta_pos)
+                    else:
+                        f = nuevo_g + min(heuristica(pos_v, m) for m in metas_pos)
+                    heapq.heappush(abiertos, (f, -nuevo_g, v))
+
+        if meta == -1:
+            return None, nodos_visitados, float('inf')
 
-        visitados.add(actual)
-        nodos_visitados = nodos_visitados + 1
+        #entre dos puntos de salto el camino es una linea recta, se rellenan las celdas intermedias
+        puntos = reconstruir_camino(laberinto, padre, inicio, meta)
+        camino = [puntos[0]]
+        for (f1, c1), (f2, c2) in zip(puntos, puntos[1:]):
+            paso_f = (f2 > f1) - (f2 < f1)
+            paso_c = (c2 > c1) - (c2 < c1)
+            while (f1, c1) != (f2, c2):
+                f1 += paso_f
+                c1 += paso_c
+                camino.append((f1, c1))
+        return camino, nodos_visitados, g_costos[meta]
 
-        if actual == meta:
-            break
 
-        for v in vecinos(laberinto, actual):
-            nuevo_costo = costo_actual + costo_celda(laberinto, v)
-
-            if v not in costos or nuevo_costo < costos[v]:
-                costos[v] = nuevo_costo
-                padre[v] = actual
-                heapq.heappush(cola, (nuevo_costo, v))
+#cada laberinto guarda su propio Solver, asi las funciones sueltas tampoco repiten la preparacion
+def obtener_solver(laberinto):
+    if laberinto.solver is None:
+        laberinto.solver = Solver(laberinto)
+    return laberinto.solver
+
+
+#inicio y meta son opcionales, sin ellos se resuelve de 'S' a 'G' como siempre
+def bfs(laberinto, inicio=None, meta=None):
+    return obtener_solver(laberinto).bfs(inicio, meta)
+
+
+def dfs(laberinto, inicio=None, meta=None):
+    return obtener_solver(laberinto).dfs(inicio, meta)
+
+
+def ucs(laberinto, inicio=None, meta=None, cola='heap'):
+    return obtener_solver(laberinto).ucs(inicio, meta, cola)
+
+
+def bfs_bidireccional(laberinto, inicio=None, meta=None):
+    return obtener_solver(laberinto).bfs_bidireccional(inicio, meta)
+
+
+def ucs_bidireccional(laberinto, inicio=None, meta=None):
+    return obtener_solver(laberinto).ucs_bidireccional(inicio, meta)
+
+
+def astar(laberinto, heuristica, inicio=None, meta=None, observador=None, cada=1, cola='heap', peso=1):
+    return obtener_solver(laberinto).astar(heuristica, inicio, meta, observador, cada, cola, peso)
+
+
+#A* anytime: regresa un generador de (camino, nodos, costo, cota), ver Solver.ara
+def ara_estrella(laberinto, heuristica, inicio=None, meta=None, peso=3, paso=0.5, tiempo=None):
+    return obtener_solver(laberinto).ara(heuristica, inicio, meta, peso, paso, tiempo)
+
+
+def jps(laberinto, heuristica=heuristica_manhattan, inicio=None, meta=None):
+    return obtener_solver(laberinto).jps(heuristica, inicio, meta)
+
+
+#alternativas a astar cuando la memoria es el limite, regresan lo mismo: (camino, nodos, costo)
+def ida_estrella(laberinto, heuristica, inicio=None, meta=None, max_nodos=100000):
+    return obtener_solver(laberinto).ida(heuristica, inicio, meta, max_nodos)
+
+
+def sma_estrella(laberinto, heuristica, inicio=None, meta=None, max_nodos=100000, max_expansiones=None):
+    return obtener_solver(laberinto).sma(heuristica, inicio, meta, max_nodos, max_expansiones)
+
+#planificador incremental (LPA*) para laberintos que cambian entre consultas.
+#guarda g (costo con el que se expandio cada celda) y rhs (el mejor costo segun sus vecinos, con
+#el padre que lo da), igual que g_costos/padre de astar pero sin borrarlos entre busquedas.
+#despues de actualizar_celdas() solo las celdas editadas y sus vecinas quedan inconsistentes
+#(g != rhs), y replanificar() repara solo la parte del arbol que depende de ellas.
+#la heuristica se baja un paso (h - 1) porque entrar a 'G' cuesta 0, asi sigue siendo consistente
+#mientras las demas celdas cuesten al menos 1, que es lo que pide LPA* para dar el camino optimo
+class PlanificadorIncremental:
+    def __init__(self, laberinto, heuristica=heuristica_manhattan, inicio=None, meta=None):
+        self.laberinto = laberinto
+        self.solver = obtener_solver(laberinto)
+        self.inicio, metas = self.solver.extremos(inicio, meta)
+        if len(metas) != 1:
+            raise ValueError("El planificador incremental necesita una sola meta")
+        self.meta = metas.pop()
+        self.meta_pos = laberinto.posicion(self.meta)
+        self.heuristica = heuristica
+
+        total = len(laberinto.celdas)
+        self.g = array('d', [math.inf]) * total
+        self.rhs = array('d', [math.inf]) * total
+        self.padre = array('i', [-1]) * total
+        self.rhs[self.inicio] = 0
+        self.abiertos = [(self.llave(self.inicio), self.inicio)]
+
+    def h(self, v):
+        return max(self.heuristica(self.laberinto.posicion(v), self.meta_pos) - 1, 0)
+
+    def llave(self, v):
+        k = min(self.g[v], self.rhs[v])
+        return (k + self.h(v), k)
+
+    #recalcula rhs de v con sus vecinos y lo mete a abiertos si quedo inconsistente
+    def actualizar_vertice(self, v):
+        laberinto = self.laberinto
+        g = self.g
+        if v != self.inicio:
+            mejor = math.inf
+            mejor_padre = -1
+            costo_v = laberinto.costos[v]
+            if costo_v != COSTO_INFINITO:
+                for d in laberinto.salidas[laberinto.mascaras[v]]:
+                    u = v + d
+                    if g[u] + costo_v < mejor:
+                        mejor = g[u] + costo_v
+                        mejor_padre = u
+            self.rhs[v] = mejor
+            self.padre[v] = mejor_padre
+        if g[v] != self.rhs[v]:
+            heapq.heappush(self.abiertos, (self.llave(v), v))
+
+    #cambia celdas del laberinto (lista de (posicion, simbolo)) y marca las celdas afectadas
+    def actualizar_celdas(self, cambios):
+        for pos, _ in cambios:
+            if self.laberinto.indice(pos) in (self.inicio, self.meta):
+                raise ValueError("No se puede editar la celda de inicio o de meta")
+        cambiadas = editar_celdas(self.laberinto, cambios)
+        afectadas = set(cambiadas)
+        for indice in cambiadas:
+            afectadas.update(vecinos_en_rejilla(self.laberinto, indice))
+        for v in afectadas:
+            self.actualizar_vertice(v)
+        return cambiadas
+
+    #repara el arbol de busqueda y regresa (camino, nodos, costo) como astar,
+    #nodos son solo las celdas expandidas en esta llamada
+    def replanificar(self):
+        laberinto = self.laberinto
+        abiertos = self.abiertos
+        g = self.g
+        rhs = self.rhs
+        meta = self.meta
+        salidas = laberinto.salidas
+        mascaras = laberinto.mascaras
+        nodos_visitados = 0
+
+        #con <= y no < porque entrar a 'G' cuesta 0: la celda anterior empata con la llave de la meta
+        while abiertos and (abiertos[0][0] <= self.llave(meta) or rhs[meta] != g[meta]):
+            llave_vieja, u = heapq.heappop(abiertos)
+            #entradas viejas de la cola: la celda ya es consistente o su llave cambio
+            if g[u] == rhs[u] or llave_vieja != self.llave(u):
+                continue
+            nodos_visitados = nodos_visitados + 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = math.inf
+                self.actualizar_vertice(u)
+            for d in salidas[mascaras[u]]:
+                self.actualizar_vertice(u + d)
 
+        if g[meta] == math.inf:
+            return None, nodos_visitados, float('inf')
+        camino = reconstruir_camino(laberinto, self.padre, self.inicio, meta)
+        return camino, nodos_visitados, int(g[meta])
+
+
+#heuristica ALT (A*, landmarks y desigualdad del triangulo): se escogen K celdas de referencia
+#y se guarda el costo minimo desde cada una a todo el laberinto (uint32, DISTANCIA_INALCANZABLE si no llega).
+#como el costo de un paso es el de la celda a la que se entra, d(x, L) = d(L, x) - c(x) + c(L), asi
+#que con la tabla desde L salen las dos cotas:
+#  d(a, b) >= d(L, b) - d(L, a)                y   d(a, b) >= d(a, L) - d(b, L)
+#la heuristica es la mayor de todas, respeta paredes y terreno a diferencia de manhattan/euclidiana.
+#las tablas valen para el contenido con el que se calcularon, si se edita el laberinto hay que rehacerlas
+DISTANCIA_INALCANZABLE = 0xFFFFFFFF
+FIRMA_ALT = b'LALT'
+CABECERA_ALT = struct.Struct('<4s16sII') #firma, huella del laberinto, k, celdas
+
+
+class HeuristicaALT:
+    def __init__(self, laberinto, landmarks, tablas):
+        self.laberinto = precalcular(laberinto)
+        self.landmarks = landmarks
+        self.tablas = tablas
+
+    #para la llave del cache de resultados: las tablas salen del laberinto (que ya va en la llave)
+    #y de los landmarks
+    def llave_cache(self):
+        return tuple(self.landmarks)
+
+    #misma firma que heuristica_manhattan: recibe coordenadas
+    def __call__(self, a, b):
+        laberinto = self.laberinto
+        i = laberinto.indice(a)
+        j = laberinto.indice(b)
+        extra = laberinto.costos[j] - laberinto.costos[i]
+        mejor = 0
+        for tabla in self.tablas:
+            da = tabla[i]
+            db = tabla[j]
+            if da == DISTANCIA_INALCANZABLE or db == DISTANCIA_INALCANZABLE:
+                continue
+            cota = max(db - da, da - db + extra)
+            if cota > mejor:
+                mejor = cota
+        return mejor
+
+    def guardar(self, ruta):
+        laberinto = self.laberinto
+        with open(ruta, 'wb') as f:
+            f.write(CABECERA_ALT.pack(FIRMA_ALT, bytes.fromhex(huella_laberinto(laberinto)),
+                                      len(self.landmarks), len(laberinto.celdas)))
+            array('I', self.landmarks).tofile(f)
+            for tabla in self.tablas:
+                tabla.tofile(f)
+
+    #regresa None si el archivo no existe o es de otro laberinto
+    @classmethod
+    def cargar(cls, ruta, laberinto):
+        try:
+            f = open(ruta, 'rb')
+        except OSError:
+            return None
+        with f:
+            cabecera = f.read(CABECERA_ALT.size)
+            if len(cabecera) != CABECERA_ALT.size:
+                return None
+            firma, huella, k, total = CABECERA_ALT.unpack(cabecera)
+            if firma != FIRMA_ALT or huella.hex() != huella_laberinto(laberinto) or total != len(laberinto.celdas):
+                return None
+            try:
+                landmarks = array('I')
+                landmarks.fromfile(f, k)
+                tablas = []
+                for _ in range(k):
+                    tabla = array('I')
+                    tabla.fromfile(f, total)
+                    tablas.append(tabla)
+            except EOFError:
+                return None
+        return cls(laberinto, list(landmarks), tablas)
+
+
+#dijkstra de uno a todos desde la celda y regresa la tabla de costos como uint32
+def tabla_distancias(solver, indice):
+    solver.dijkstra(indice, ())
+    gen = solver.generacion
+    vistos = solver.vistos
+    costos = solver.costos
+    tabla = array('I', [DISTANCIA_INALCANZABLE]) * len(vistos)
+    for i in range(len(vistos)):
+        if vistos[i] == gen:
+            tabla[i] = costos[i]
+    return tabla
+
+
+#escoge k landmarks por el mas lejano: el primero es la celda mas lejana a 'S' (o a la primera
+#celda libre) y cada siguiente es la que queda mas lejos de todos los ya escogidos.
+#asi quedan en las orillas del laberinto, que es donde dan mejores cotas
+def preparar_alt(laberinto, k=8):
+    solver = obtener_solver(laberinto)
+    total = len(laberinto.celdas)
+    origen = solver.inicio
+    if origen is None:
+        origen = next((i for i in range(total) if laberinto.mascaras[i]), None)
+        if origen is None:
+            raise ValueError("El laberinto no tiene celdas libres")
+
+    lejania = tabla_distancias(solver, origen)
+    landmarks = []
+    tablas = []
+    for _ in range(k):
+        siguiente = max(range(total), key=lambda i: -1 if lejania[i] == DISTANCIA_INALCANZABLE else lejania[i])
+        if siguiente in landmarks:
+            break
+        tabla = tabla_distancias(solver, siguiente)
+        landmarks.append(siguiente)
+        tablas.append(tabla)
+        if len(landmarks) == 1:
+            lejania = array('I', tabla)
+        else:
+            for i in range(total):
+                if tabla[i] < lejania[i]:
+                    lejania[i] = tabla[i]
+    return HeuristicaALT(laberinto, landmarks, tablas)
+
+
+#carga las tablas guardadas junto al archivo del laberinto (ruta + '.alt') o las calcula y las guarda
+def heuristica_alt(laberinto, ruta_laberinto, k=8):
+    ruta = ruta_laberinto + '.alt'
+    alt = HeuristicaALT.cargar(ruta, laberinto)
+    if alt is None or len(alt.landmarks) < k:
+        alt = preparar_alt(laberinto, k)
+        alt.guardar(ruta)
+    return alt
+
+
+#busqueda jerarquica (HPA*): el laberinto se parte en bloques de tamano x tamano.
+#en cada frontera entre dos bloques vecinos se buscan los tramos donde se puede cruzar y cada tramo
+#da una o dos entradas (una celda de cada lado). el grafo abstracto tiene como nodos esas celdas:
+#- aristas entre bloques: cruzar la frontera, cuesta lo de la celda a la que se entra
+#- aristas dentro de un bloque: costo minimo entre dos entradas del mismo bloque, con ucs sobre
+#  un laberinto chico que solo tiene las celdas del bloque
+#una consulta conecta inicio y meta con las entradas de su bloque, busca en el grafo abstracto y
+#solo refina (ucs de nuevo) los bloques por los que pasa el camino, asi el costo de la consulta no
+#depende del tamano del laberinto. el camino queda cerca del optimo pero no siempre es el optimo
+class MapaJerarquico:
+    def __init__(self, laberinto, tamano=16):
+        self.laberinto = precalcular(laberinto)
+        self.solver = obtener_solver(laberinto)
+        self.tamano = tamano
+        self.bloques_filas = -(-laberinto.alto // tamano)
+        self.bloques_columnas = -(-laberinto.ancho // tamano)
+        self.aristas = {}   #nodo -> {nodo vecino: costo}, los nodos son indices de celda
+        self.entradas = {}  #bloque -> lista de nodos en ese bloque
+        self.buscar_entradas()
+        for bloque in list(self.entradas):
+            self.conectar_bloque(bloque)
+
+    def bloque(self, indice):
+        fila, columna = self.laberinto.posicion(indice)
+        return fila // self.tamano, columna // self.tamano
+
+    #laberinto chico con solo las celdas del bloque, regresa el Grid y la esquina del bloque
+    def subgrid(self, bloque):
+        laberinto = self.laberinto
+        fila0 = bloque[0] * self.tamano
+        columna0 = bloque[1] * self.tamano
+        alto = min(self.tamano, laberinto.alto - fila0)
+        ancho = min(self.tamano, laberinto.ancho - columna0)
+        celdas = bytearray()
+        for i in range(fila0, fila0 + alto):
+            inicio = i * laberinto.paso_fila + columna0
+            celdas += laberinto.celdas[inicio:inicio + ancho]
+        return Grid(celdas, ancho, alto, laberinto.tabla_costos), (fila0, columna0)
+
+    def cruzable(self, indice):
+        return self.laberinto.celdas[indice] != PARED and self.laberinto.costos[indice] != COSTO_INFINITO
+
+    def agregar_arista(self, a, b, costo):
+        vecinos = self.aristas.setdefault(a, {})
+        if costo < vecinos.get(b, math.inf):
+            vecinos[b] = costo
+
+    def agregar_entrada(self, a, b):
+        costos = self.laberinto.costos
+        self.agregar_arista(a, b, costos[b])
+        self.agregar_arista(b, a, costos[a])
+        for nodo in (a, b):
+            nodos = self.entradas.setdefault(self.bloque(nodo), [])
+            if nodo not in nodos:
+                nodos.append(nodo)
+
+    #recorre cada frontera y parte en tramos las parejas de celdas cruzables.
+    #tramos cortos dan una entrada en medio, los largos una en cada punta
+    def buscar_entradas(self):
+        laberinto = self.laberinto
+        paso = laberinto.paso_fila
+        tamano = self.tamano
+        fronteras = []
+        for fila in range(tamano - 1, laberinto.alto - 1, tamano):
+            for columna0 in range(0, laberinto.ancho, tamano):
+                columnas = range(columna0, min(columna0 + tamano, laberinto.ancho))
+                fronteras.append([(fila * paso + c, (fila + 1) * paso + c) for c in columnas])
+        for columna in range(tamano - 1, laberinto.ancho - 1, tamano):
+            for fila0 in range(0, laberinto.alto, tamano):
+                filas = range(fila0, min(fila0 + tamano, laberinto.alto))
+                fronteras.append([(f * paso + columna, f * paso + columna + 1) for f in filas])
+
+        for frontera in fronteras:
+            tramo = []
+            for a, b in frontera + [(None, None)]:
+                if a is not None and self.cruzable(a) and self.cruzable(b):
+                    tramo.append((a, b))
+                    continue
+                if len(tramo) >= 6:
+                    self.agregar_entrada(*tramo[0])
+                    self.agregar_entrada(*tramo[-1])
+                elif tramo:
+                    self.agregar_entrada(*tramo[len(tramo) // 2])
+                tramo = []
+
+    #costos entre todas las entradas de un bloque, un ucs de uno a todos por entrada
+    def conectar_bloque(self, bloque):
+        sub, (fila0, columna0) = self.subgrid(bloque)
+        solver = obtener_solver(sub)
+        locales = [(nodo, self.local(nodo, fila0, columna0)) for nodo in self.entradas[bloque]]
+        for a, pos_a in locales:
+            solver.ucs_desde(pos_a)
+            for b, pos_b in locales:
+                if a != b:
+                    costo = solver.costo_hasta(pos_b)
+                    if costo != math.inf:
+                        self.agregar_arista(a, b, costo)
+
+    def local(self, indice, fila0, columna0):
+        fila, columna = self.laberinto.posicion(indice)
+        return fila - fila0, columna - columna0
+
+    #regresa (camino, nodos, costo) como astar. con exacto=True se refina a la ruta optima
+    #con astar sobre todo el laberinto (ya sin la cota de tiempo por consulta)
+    def buscar(self, inicio=None, meta=None, exacto=False):
+        if exacto:
+            return self.solver.astar(heuristica_manhattan, inicio, meta)
+
+        laberinto = self.laberinto
+        inicio, metas = self.solver.extremos(inicio, meta)
+        if len(metas) != 1:
+            raise ValueError("La busqueda jerarquica necesita una sola meta")
+        meta = metas.pop()
+        if self.solver.sin_conexion(inicio, (meta,)):
+            return None, 0, float('inf')
+        if inicio == meta:
+            return [laberinto.posicion(inicio)], 1, 0
+        nodos_visitados = 0
+        subgrids = {}
+
+        def subgrid(bloque):
+            if bloque not in subgrids:
+                subgrids[bloque] = self.subgrid(bloque)
+            return subgrids[bloque]
+
+        #inicio hacia las entradas de su bloque
+        bloque_inicio = self.bloque(inicio)
+        sub, esquina = subgrid(bloque_inicio)
+        solver = obtener_solver(sub)
+        nodos_visitados += solver.ucs_desde(self.local(inicio, *esquina))
+        salidas_inicio = {}
+        for nodo in self.entradas.get(bloque_inicio, []):
+            costo = solver.costo_hasta(self.local(nodo, *esquina))
+            if costo != math.inf:
+                salidas_inicio[nodo] = costo
+        if self.bloque(meta) == bloque_inicio:
+            costo = solver.costo_hasta(self.local(meta, *esquina))
+            if costo != math.inf:
+                salidas_inicio[meta] = costo
+
+        #entradas del bloque de la meta hacia la meta, con un solo ucs desde la meta:
+        #d(e, meta) = d(meta, e) - c(e) + c(meta), igual que en HeuristicaALT
+        bloque_meta = self.bloque(meta)
+        sub, esquina = subgrid(bloque_meta)
+        solver = obtener_solver(sub)
+        nodos_visitados += solver.ucs_desde(self.local(meta, *esquina))
+        llegadas_meta = {}
+        costos = laberinto.costos
+        for nodo in self.entradas.get(bloque_meta, []):
+            costo = solver.costo_hasta(self.local(nodo, *esquina))
+            if costo != math.inf:
+                llegadas_meta[nodo] = costo - costos[nodo] + costos[meta]
+
+        #A* sobre el grafo abstracto
+        meta_pos = laberinto.posicion(meta)
+        g = {inicio: 0}
+        padre = {inicio: -1}
+        cerrados = set()
+        abiertos = [(0, inicio)]
+        while abiertos:
+            _, actual = heapq.heappop(abiertos)
+            if actual in cerrados:
+                continue
+            cerrados.add(actual)
+            nodos_visitados = nodos_visitados + 1
+            if actual == meta:
+                break
+            vecinos_abstractos = list(self.aristas.get(actual, {}).items())
+            if actual == inicio:
+                vecinos_abstractos += salidas_inicio.items()
+            if actual in llegadas_meta:
+                vecinos_abstractos.append((meta, llegadas_meta[actual]))
+            for v, costo in vecinos_abstractos:
+                nuevo_g = g[actual] + costo
+                if nuevo_g < g.get(v, math.inf):
+                    g[v] = nuevo_g
+                    padre[v] = actual
+                    h = max(heuristica_manhattan(laberinto.posicion(v), meta_pos) - 1, 0)
+                    heapq.heappush(abiertos, (nuevo_g + h, v))
+
+        if meta not in cerrados:
+            return None, nodos_visitados, float('inf')
 
-    #reconstruccion del camino
-    camino = []
-    actual = meta
+        abstracto = [meta]
+        while padre[abstracto[-1]] != -1:
+            abstracto.append(padre[abstracto[-1]])
+        abstracto.reverse()
+
+        #refinamiento: entre dos nodos del mismo bloque se corre ucs en ese bloque,
+        #entre bloques distintos los nodos son vecinos y basta un paso
+        camino = [laberinto.posicion(inicio)]
+        for a, b in zip(abstracto, abstracto[1:]):
+            bloque = self.bloque(a)
+            if bloque != self.bloque(b):
+                camino.append(laberinto.posicion(b))
+                continue
+            sub, (fila0, columna0) = subgrid(bloque)
+            tramo, nodos, _ = obtener_solver(sub).ucs(self.local(a, fila0, columna0), self.local(b, fila0, columna0))
+            nodos_visitados += nodos
+            camino.extend((fila + fila0, columna + columna0) for fila, columna in tramo[1:])
+        return camino, nodos_visitados, g[meta]
+
+
+#BFS vectorizado con numpy: en cada paso se expande toda la frontera a la vez.
+#la frontera es un arreglo de indices, con la mascara precalculada de cada celda se sacan
+#sus vecinos en las 4 direcciones (indice + desplazamiento) y se quedan los que no tienen distancia.
+#regresa un arreglo alto x ancho con la distancia en pasos desde el inicio (-1 si no se alcanza).
+#si se da meta se detiene en la capa donde aparece la primera
+def campo_distancias(laberinto, inicio=None, meta=None):
+    if np is None:
+        raise ImportError("campo_distancias necesita numpy (pip install numpy)")
+    solver = obtener_solver(laberinto)
+    if inicio is None:
+        inicio, _ = solver.extremos(None, (0, 0))
+    else:
+        inicio = solver.indice(inicio)
+    metas = None
+    if meta is not None:
+        _, metas = solver.extremos(laberinto.posicion(inicio), meta)
+
+    distancias = _frente_de_onda(laberinto, inicio, metas)
+    paso_fila = laberinto.paso_fila
+    total = len(distancias)
+    #se completa la ultima fila si al archivo le falta el salto final, o se corta lo que sobra despues
+    #de ella si el archivo termina en lineas en blanco, y se quitan las columnas de relleno
+    tamano = laberinto.alto * paso_fila
+    if total < tamano:
+        distancias = np.concatenate([distancias, np.full(tamano - total, -1, dtype=np.int32)])
+    else:
+        distancias = distancias[:tamano]
+    return distancias.reshape(laberinto.alto, paso_fila)[:, :laberinto.ancho]
+
+
+#el frente de onda sobre los indices lineales del laberinto (con todo y columnas de relleno)
+def _frente_de_onda(laberinto, inicio, metas=None):
+    if metas is not None:
+        metas = np.fromiter(metas, dtype=np.int64)
+
+    paso_fila = laberinto.paso_fila
+    total = len(laberinto.mascaras)
+    mascaras = np.frombuffer(laberinto.mascaras, dtype=np.uint8)
+    bits = np.array([ARRIBA, ABAJO, IZQUIERDA, DERECHA], dtype=np.uint8)
+    desplazamientos = np.array([-paso_fila, paso_fila, -1, 1], dtype=np.intp)
+
+    distancias = np.full(total, -1, dtype=np.int32)
+    distancias[inicio] = 0
+    #para quitar repetidos sin ordenar: cada candidato escribe su posicion y solo se queda el que gano
+    posiciones = np.empty(total, dtype=np.intp)
+    consecutivos = np.arange(1024, dtype=np.intp)
+    frontera = np.array([inicio], dtype=np.intp)
+    paso = 0
+    while frontera.size:
+        if metas is not None and (distancias[metas] >= 0).any():
+            break
+        paso += 1
+        validos = (mascaras.take(frontera)[:, None] & bits) != 0
+        candidatos = (frontera[:, None] + desplazamientos)[validos]
+        candidatos = candidatos[distancias.take(candidatos) < 0]
+        distancias[candidatos] = paso
+        if candidatos.size > consecutivos.size:
+            consecutivos = np.arange(2 * candidatos.size, dtype=np.intp)
+        orden = consecutivos[:candidatos.size]
+        posiciones[candidatos] = orden
+        frontera = candidatos[posiciones.take(candidatos) == orden]
+
+    return distancias
+
+
+#mismo resultado que bfs (camino igual de largo) pero con el frente de onda de campo_distancias.
+#el camino se saca bajando por el campo desde la meta: siempre a un vecino con distancia - 1
+def bfs_numpy(laberinto, inicio=None, meta=None):
+    solver = obtener_solver(laberinto)
+    inicio, metas = solver.extremos(inicio, meta)
+    if np is None:
+        raise ImportError("bfs_numpy necesita numpy (pip install numpy)")
+    if solver.sin_conexion(inicio, metas):
+        return None, 0
+    distancias = _frente_de_onda(laberinto, inicio, metas)
+
+    alcanzadas = [m for m in metas if distancias[m] >= 0]
+    if not alcanzadas:
+        return None, int((distancias >= 0).sum())
+    actual = min(alcanzadas, key=lambda m: distancias[m])
+    nodos_visitados = int(((distancias >= 0) & (distancias <= distancias[actual])).sum())
+
+    mascaras = laberinto.mascaras
+    salidas = laberinto.salidas
+    camino = [laberinto.posicion(actual)]
     while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
-            return None, nodos_visitados, float('inf')
-    camino.append(inicio)
+        buscada = distancias[actual] - 1
+        for d in salidas[mascaras[actual]]:
+            if distancias[actual + d] == buscada:
+                actual = actual + d
+                break
+        camino.append(laberinto.posicion(actual))
     camino.reverse()
+    return camino, nodos_visitados
 
-    return camino, nodos_visitados, costos[meta]
-
-
-#Algoritmo de A*
-
-def astar(laberinto, heuristica):
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
-
-    abiertos = []
-    f_inicial = 0
-    elemento = (f_inicial, inicio)
-    heapq.heappush(abiertos, elemento)
-
-    g_costos = {inicio: 0}
-    padre = {}
-    cerrados = set()
-    nodos_visitados = 0
-
-    while len(abiertos) > 0:
-        elemento = heapq.heappop(abiertos)
-        actual = elemento[1]
 
+#calculo por lotes de muchos origenes a muchos destinos:
+#cada proceso del pool tiene su propio Solver sobre el mismo laberinto y corre un dijkstra
+#de uno a todos por origen, de ahi lee el costo a todos los destinos.
+#con fork los procesos heredan el bytearray del laberinto sin copiarlo (solo lectura)
+_solver_trabajador = None
+_destinos_trabajador = None
 
-        if actual in cerrados:
-            continue
 
-        cerrados.add(actual)
-        nodos_visitados = nodos_visitados + 1
-
-        # Camino parcial
-        camino_parcial = []
-        aux = actual
-        while aux != inicio:
-            camino_parcial.append(aux)
-            aux = padre[aux]
+def _iniciar_trabajador(laberinto, destinos):
+    global _solver_trabajador, _destinos_trabajador
+    _solver_trabajador = Solver(laberinto)
+    _destinos_trabajador = destinos
 
-        
-        nodo_abiertos = []
-        for elemento in abiertos:
-            nodo = elemento[1]
-            nodo_abiertos.append(nodo)
-            
-        mostrar_laberinto_aestrella(
-            laberinto,
-            nodo_abiertos,
-            cerrados,
-            camino_parcial
-        )
-
-        if actual == meta:
-            break
-        
-        #metodo de relajación, si se llego a este nodo, y el nuevo camino es más barato, se toma ese
-        for v in vecinos(laberinto, actual):
-            nuevo_g = g_costos[actual] + costo_celda(laberinto, v)
 
-            ya_esta_cerrado = v in cerrados #ya fue evaluado el nodo se usara como if para continuar con el algoritmo
-            costo_guardado = g_costos.get(v, float('inf'))
-            costo_nuevo = nuevo_g
-            
-            if ya_esta_cerrado and costo_nuevo >= costo_guardado:
-                continue
-                
-            #se actualiza la información de las variables gracias al metodo de relajacion
-            costo_anterior = g_costos.get(v, float('inf'))
-            costo_nuevo = nuevo_g
-            
-            if nuevo_g < costo_anterior:
-                #se guarda de donde viene el nodo o actualiza
-                padre[v] = actual
-                #Se actualiza el mejor costo conocido
-                g_costos[v] = costo_nuevo
-                #se recalcula la heuristica
-                costo_estimado = heuristica(v, meta)
-                f = costo_nuevo + costo_estimado
-                heapq.heappush(abiertos, (f,v))
-                
+def _fila_costos(origen):
+    _solver_trabajador.ucs_desde(origen)
+    return [_solver_trabajador.costo_hasta(meta) for meta in _destinos_trabajador]
 
-    # Reconstrucción del camino, es la misma que ucs
-    camino = []
-    actual = meta
-    while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
-            return None, nodos_visitados, float('inf')
-    camino.append(inicio)
-    camino.reverse()
 
-    return camino, nodos_visitados, g_costos[meta]
+#regresa una matriz densa: matriz[i][j] = costo minimo de origenes[i] a destinos[j] (inf si no hay camino)
+def matriz_costos(laberinto, origenes, destinos, procesos=None):
+    precalcular(laberinto)
+    destinos = list(destinos)
+    #copia ligera sin el Solver cacheado, comparte las celdas y las tablas de precalcular
+    #para que ningun trabajador las vuelva a armar
+    base = Grid(laberinto.celdas, laberinto.ancho, laberinto.alto, laberinto.tabla_costos, laberinto.paso_fila)
+    base.posiciones = laberinto.posiciones
+    base.costos = laberinto.costos
+    base.mascaras = laberinto.mascaras
+    base.salidas = laberinto.salidas
 
+    if procesos == 1 or len(origenes) <= 1:
+        global _solver_trabajador, _destinos_trabajador
+        _iniciar_trabajador(base, destinos)
+        try:
+            return [_fila_costos(origen) for origen in origenes]
+        finally:
+            #los arreglos del Solver miden lo mismo que el laberinto, no se quedan en el modulo
+            _solver_trabajador = None
+            _destinos_trabajador = None
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context('fork')
+    else:
+        contexto = multiprocessing.get_context()
+
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                             initializer=_iniciar_trabajador, initargs=(base, destinos)) as pool:
+        trabajadores = procesos or os.cpu_count() or 1
+        bloque = max(1, len(origenes) // (trabajadores * 4))
+        return list(pool.map(_fila_costos, origenes, chunksize=bloque))
+
+
+#huella del contenido del laberinto: celdas (sin relleno de fin de fila), dimensiones y tabla de costos.
+#se calcula una vez y se guarda en el Grid, si se editan las celdas hay que regresarla a None
+def huella_laberinto(laberinto):
+    if laberinto.huella is None:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(struct.pack('<II', laberinto.ancho, laberinto.alto))
+        h.update(repr(sorted(laberinto.tabla_costos.items())).encode())
+        for i in range(laberinto.alto):
+            inicio = i * laberinto.paso_fila
+            h.update(laberinto.celdas[inicio:inicio + laberinto.ancho])
+        laberinto.huella = h.hexdigest()
+    return laberinto.huella
+
+
+#nombre estable de un algoritmo o heuristica para la llave del cache: modulo + nombre completo.
+#un partial se identifica por su funcion y sus argumentos, y un objeto llamable (HeuristicaALT)
+#por su clase y lo que regresa su metodo llave_cache. las lambdas y funciones locales no
+#tienen un nombre que las distinga (todas las lambdas se llaman <lambda>), para esas hay que
+#pasar nombre explicito
+def identidad_funcion(funcion):
+    if isinstance(funcion, partial):
+        argumentos = tuple(identidad_funcion(a) if callable(a) else a for a in funcion.args)
+        palabras = tuple(sorted((k, identidad_funcion(v) if callable(v) else v)
+                                for k, v in funcion.keywords.items()))
+        return (identidad_funcion(funcion.func), argumentos, palabras)
+    if hasattr(funcion, 'llave_cache') and not isinstance(funcion, type):
+        return (identidad_funcion(type(funcion)), funcion.llave_cache())
+    nombre = getattr(funcion, '__qualname__', None)
+    modulo = getattr(funcion, '__module__', None)
+    if nombre is None or modulo is None or '<lambda>' in nombre or '<locals>' in nombre:
+        raise ValueError(f"{funcion!r} no tiene un nombre estable para el cache, hay que pasar nombre")
+    return modulo + '.' + nombre
+
+
+#cache de resultados (camino, nodos, costo) con llave (huella, algoritmo, heuristica, inicio, meta).
+#en memoria es un LRU limitado por bytes (el tamano de cada resultado serializado). el disco es
+#opcional: solo si se da un directorio cada resultado tambien se guarda ahi en un archivo y
+#sobrevive entre ejecuciones. esos archivos se leen con pickle, asi que el directorio tiene que
+#ser de confianza; se guarda como ruta absoluta para que un chdir no cambie de donde se leen
+class CacheResultados:
+    def __init__(self, max_bytes=64 * 1024 * 1024, directorio=None):
+        self.max_bytes = max_bytes
+        self.directorio = None if directorio is None else os.path.abspath(os.path.expanduser(directorio))
+        self.entradas = OrderedDict() #llave -> (resultado, bytes)
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    #nombre reemplaza la identidad de algoritmo y heuristica, sirve para lambdas y funciones locales
+    def llave(self, laberinto, algoritmo, heuristica=None, inicio=None, meta=None, nombre=None):
+        if meta is not None and not isinstance(meta[0], int):
+            meta = tuple(sorted(tuple(m) for m in meta))
+        elif meta is not None:
+            meta = tuple(meta)
+        if nombre is None:
+            nombre = (identidad_funcion(algoritmo),
+                      None if heuristica is None else identidad_funcion(heuristica))
+        return (huella_laberinto(laberinto), nombre,
+                None if inicio is None else tuple(inicio), meta)
+
+    def archivo(self, llave):
+        nombre = hashlib.blake2b(repr(llave).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directorio, nombre + '.pkl')
+
+    def obtener(self, llave):
+        if llave in self.entradas:
+            self.entradas.move_to_end(llave)
+            self.aciertos += 1
+            return self.entradas[llave][0]
+        if self.directorio is not None:
+            try:
+                with open(self.archivo(llave), 'rb') as f:
+                    guardada, resultado = pickle.load(f)
+            except (OSError, pickle.PickleError, EOFError, ValueError):
+                guardada = None
+            #se revisa la llave completa por si dos llaves dan el mismo nombre de archivo
+            if guardada == llave:
+                self.aciertos += 1
+                self.recordar(llave, resultado, len(pickle.dumps(resultado)))
+                return resultado
+        self.fallos += 1
+        return None
+
+    def guardar(self, llave, resultado):
+        datos = pickle.dumps(resultado)
+        self.recordar(llave, resultado, len(datos))
+        if self.directorio is not None:
+            os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+            ruta = self.archivo(llave)
+            temporal = ruta + '.tmp'
+            with open(temporal, 'wb') as f:
+                pickle.dump((llave, resultado), f)
+            os.replace(temporal, ruta) #asi nunca queda un archivo a medias
+
+    #mete la entrada al LRU y saca las mas viejas hasta que todo quepa en max_bytes
+    def recordar(self, llave, resultado, tamano):
+        if llave in self.entradas:
+            self.bytes -= self.entradas.pop(llave)[1]
+        if tamano > self.max_bytes:
+            return
+        self.entradas[llave] = (resultado, tamano)
+        self.bytes += tamano
+        while self.bytes > self.max_bytes:
+            _, (_, viejo) = self.entradas.popitem(last=False)
+            self.bytes -= viejo
+
+    def limpiar(self):
+        self.entradas.clear()
+        self.bytes = 0
+
+    #regresa (camino, nodos, costo) del cache o corre el algoritmo y lo guarda.
+    #observador y cada solo se pasan a astar y no cuentan para la llave
+    def resolver(self, laberinto, algoritmo, heuristica=None, inicio=None, meta=None, observador=None, nombre=None, cada=1):
+        llave = self.llave(laberinto, algoritmo, heuristica, inicio, meta, nombre)
+        resultado = self.obtener(llave)
+        if resultado is not None:
+            return resultado
+
+        if heuristica is None:
+            resultado = algoritmo(laberinto, inicio=inicio, meta=meta)
+        elif observador is None:
+            resultado = algoritmo(laberinto, heuristica, inicio=inicio, meta=meta)
+        else:
+            resultado = algoritmo(laberinto, heuristica, inicio=inicio, meta=meta, observador=observador, cada=cada)
+        if len(resultado) == 2:
+            camino, nodos = resultado
+            resultado = (camino, nodos, costo_camino(laberinto, camino))
+        self.guardar(llave, tuple(resultado))
+        return tuple(resultado)
+
+
+#corre cada algoritmo dos veces por un cache nuevo (con A* Manhattan y con ALT, que es un objeto
+#llamable) y revisa que la segunda vez salga del cache con el mismo resultado.
+#regresa los nombres de los casos que fallan
+def verificar_cache_resultados(texto=LABERINTO_DEFAULT):
+    laberinto = cargar_laberinto(texto)
+    casos = [('bfs', bfs, None), ('ucs', ucs, None), ('astar_manhattan', astar, heuristica_manhattan),
+             ('astar_alt', astar, preparar_alt(laberinto, 4))]
+    errores = []
+    for nombre, algoritmo, heuristica in casos:
+        cache = CacheResultados()
+        primero = cache.resolver(laberinto, algoritmo, heuristica)
+        #otra copia del laberinto y, para ALT, otras tablas con los mismos landmarks
+        otro = cargar_laberinto(texto)
+        if isinstance(heuristica, HeuristicaALT):
+            heuristica = preparar_alt(otro, 4)
+        segundo = cache.resolver(otro, algoritmo, heuristica)
+        if cache.aciertos != 1 or segundo != primero:
+            errores.append(nombre)
+    return errores
+
+
+#las funciones de mostrar arman todo el cuadro en memoria y lo escriben con una sola llamada,
+#antes era un print por celda
 def mostrar_laberinto(laberinto, camino):
-    camino_set = set(camino) if camino else set()
+    camino_set = set(laberinto.indice(pos) for pos in camino) if camino else set()
 
-    for i, fila in enumerate(laberinto):
+    partes = []
+    for i, fila in enumerate(laberinto.filas()):
+        base = i * laberinto.paso_fila
         for j, celda in enumerate(fila):
-            pos = (i, j)
+            pos = base + j
             if celda == 'S':
-                print(YELLOW + 'S' + RESET, end='')
+                partes.append(YELLOW + 'S' + RESET)
             elif celda == 'G':
-                print(RED + 'G' + RESET, end='')
+                partes.append(RED + 'G' + RESET)
                 #se cambio '.' a celda para que los 3 algoritmos puedan imprimir todos los simbolos
             elif pos in camino_set:
-                print(GREEN + celda + RESET, end='') 
+                partes.append(GREEN + celda + RESET)
             else:
-                print(GRAY + celda + RESET, end='')
-        print()
-        
-#función para mostrar la impresión del A*, por que como pide un nuevo color, no podemos usar la función normal de mostrar laberinto por los colores
-#es casi lo mismo que el otro mostrar, pero en este tenemos que ir mostrando los caminos parciales
-def mostrar_laberinto_aestrella(laberinto, abiertos, cerrados, camino_parcial):
-    abiertos = set(abiertos)
-    cerrados = set(cerrados)
-    camino_parcial = set(camino_parcial)
-
-    for i, fila in enumerate(laberinto):
+                partes.append(GRAY + celda + RESET)
+        partes.append('\n')
+    sys.stdout.write(''.join(partes))
+
+
+#estados de una celda en la animacion de A*, se usan para el cuadro completo y para los cambios
+NORMAL = 0
+CERRADO = 1
+ABIERTO = 2
+CAMINO = 3
+COLOR_ESTADO = {NORMAL: '', CERRADO: GRAY, ABIERTO: BLUE, CAMINO: GREEN}
+
+
+#texto de una celda segun su estado, 'S' y 'G' siempre llevan su propio color
+def texto_celda(celda, estado):
+    if celda == 'S':
+        return YELLOW + 'S' + RESET
+    elif celda == 'G':
+        return RED + 'G' + RESET
+    elif estado == NORMAL:
+        return celda
+    return COLOR_ESTADO[estado] + celda + RESET
+
+
+#estado de cada celda tocada por A*, el camino gana sobre abiertos y abiertos sobre cerrados
+def estados_aestrella(abiertos, cerrados, camino_parcial):
+    estados = dict.fromkeys(cerrados, CERRADO)
+    estados.update(dict.fromkeys(abiertos, ABIERTO))
+    estados.update(dict.fromkeys(camino_parcial, CAMINO))
+    return estados
+
+
+def cuadro_aestrella(laberinto, estados):
+    partes = []
+    for i, fila in enumerate(laberinto.filas()):
+        base = i * laberinto.paso_fila
         for j, celda in enumerate(fila):
-            pos = (i, j)
+            partes.append(texto_celda(celda, estados.get(base + j, NORMAL)))
+        partes.append('\n')
+    return ''.join(partes)
 
-            if celda == 'S':
-                print(YELLOW + 'S' + RESET, end='')
 
-            elif celda == 'G':
-                print(RED + 'G' + RESET, end='')
-
-            elif pos in camino_parcial:
-                print(GREEN + celda + RESET, end='')
+#función para mostrar la impresión del A*, por que como pide un nuevo color, no podemos usar la función normal de mostrar laberinto por los colores
+#es casi lo mismo que el otro mostrar, pero en este tenemos que ir mostrando los caminos parciales
+#abiertos, cerrados y camino_parcial son indices de celdas
+def mostrar_laberinto_aestrella(laberinto, abiertos, cerrados, camino_parcial):
+    sys.stdout.write(cuadro_aestrella(laberinto, estados_aestrella(abiertos, cerrados, camino_parcial)))
+    sys.stdout.flush()
 
-            elif pos in abiertos:
-                print(BLUE + celda + RESET, end='')
+    time.sleep(0.1)
+    print("\n", end="")  #salto de linea para que se vea bonito
 
-            elif pos in cerrados:
-                print(GRAY + celda + RESET, end='')
 
-            else:
-                print(celda, end='')
-        print()
+#animacion de A* en el mismo lugar de la terminal: el primer cuadro se dibuja completo y despues
+#solo se reescriben las celdas que cambiaron de estado, moviendo el cursor con codigos ANSI.
+#se usa como observador de astar y recibe solo los cambios (por_cambios): los nodos metidos a la
+#cola y los cerrados desde el cuadro anterior, mas el camino parcial. el estado de las celdas se
+#guarda aqui, asi cada cuadro cuesta lo que cambio y no lo que mide el laberinto
+class AnimacionTerminal:
+    por_cambios = True
+
+    def __init__(self, pausa=0.0, salida=None):
+        self.pausa = pausa
+        self.salida = salida if salida is not None else sys.stdout
+        self.laberinto = None
+        self.estados = {} #abierto o cerrado de cada celda tocada, sin el camino
+        self.camino = set() #camino parcial que se dibujo la ultima vez
+
+    def estado(self, pos):
+        if pos in self.camino:
+            return CAMINO
+        return self.estados.get(pos, NORMAL)
+
+    def __call__(self, laberinto, abiertos, cerrados, camino_parcial):
+        camino = set(camino_parcial)
+        if laberinto is not self.laberinto:
+            self.laberinto = laberinto
+            self.estados = {}
+            self.camino = set()
+            tocados = None
+        else:
+            tocados = self.camino | camino
+            tocados.update(abiertos)
+            tocados.update(cerrados)
+            anteriores = {pos: self.estado(pos) for pos in tocados}
+
+        #cerrados despues de abiertos: un nodo que entro y salio de la cola en el mismo cuadro queda cerrado
+        self.estados.update(dict.fromkeys(abiertos, ABIERTO))
+        self.estados.update(dict.fromkeys(cerrados, CERRADO))
+        self.camino = camino
+
+        if tocados is None:
+            estados = dict(self.estados)
+            estados.update(dict.fromkeys(camino, CAMINO))
+            texto = "\033[2J\033[H" + cuadro_aestrella(laberinto, estados)
+        else:
+            partes = []
+            celdas = laberinto.celdas
+            paso_fila = laberinto.paso_fila
+            for pos in tocados:
+                estado = self.estado(pos)
+                if anteriores[pos] != estado:
+                    fila, columna = divmod(pos, paso_fila)
+                    partes.append(f"\033[{fila + 1};{columna + 1}H")
+                    partes.append(texto_celda(chr(celdas[pos]), estado))
+            partes.append(f"\033[{laberinto.alto + 1};1H")
+            texto = ''.join(partes)
+
+        self.salida.write(texto)
+        self.salida.flush()
+        if self.pausa:
+            time.sleep(self.pausa)
+
+
+#cuadros que se dibujan a lo mucho al animar A* desde el menu, el resto de las expansiones
+#se juntan en el siguiente cuadro
+CUADROS_ANIMACION = 200
 
-    time.sleep(0.1)
-    print("\n", end="")  #salto de linea para que se vea bonito
-    
 
 #Nuevo ejecutar para A*    
 def ejecutar_astar(heuristica, nombre):
-    lab = cargar_laberinto(laberinto_actual)
+    lab = laberinto_actual
 
     inicio = time.perf_counter()
-    camino, nodos, costo = astar(lab, heuristica)
+    #la animacion ahora va como observador de A*, solo redibuja las celdas que cambian.
+    #se dibuja un cuadro cada tantas expansiones para no pasar de CUADROS_ANIMACION
+    #si el resultado ya esta en el cache no hay busqueda ni animacion
+    cada = max(1, lab.ancho * lab.alto // CUADROS_ANIMACION)
+    camino, nodos, costo = cache_resultados.resolver(lab, astar, heuristica, observador=AnimacionTerminal(pausa=0.05), cada=cada)
     fin = time.perf_counter()
 
     print(f"\n== A* ({nombre}) ==")
@@ -374,16 +2824,12 @@ def ejecutar_astar(heuristica, nombre):
 
 
 def ejecutar(algoritmo, nombre):
-    lab = cargar_laberinto(laberinto_actual)
+    lab = laberinto_actual
 
     inicio = time.perf_counter()
     
-    #actualizacion en ejecutar para poder usas ucs
-    if nombre == "UCS":
-        camino, nodos, costo = algoritmo(lab)
-    else:
-        camino, nodos = algoritmo(lab)
-        costo = costo_camino(lab, camino)
+    #el cache regresa siempre 3 valores, a los algoritmos sin costo se les calcula con costo_camino
+    camino, nodos, costo = cache_resultados.resolver(lab, algoritmo)
 
     fin = time.perf_counter()
 
@@ -401,49 +2847,77 @@ def ejecutar(algoritmo, nombre):
 
 
 
-laberinto_actual = LABERINTO_DEFAULT
-
-
-ejecutando = True
-while ejecutando:
-    print("\n=== Menú Principal ===")
-    print("1) Resolver con BFS")
-    print("2) Resolver con DFS")
-    print("3) Resolver con UCS")
-    print("4) A* con heurística Manhattan")
-    print("5) A* con heurística Euclidiana")
-    print("6) Cambiar laberinto (ruta de archivo)")
-    print("7) Salir")
+#el laberinto se carga una sola vez y se reutiliza en todas las corridas
+laberinto_actual = cargar_laberinto(LABERINTO_DEFAULT)
+
+#resultados de corridas anteriores en memoria. el cache en disco (para que sobrevivan al reiniciar)
+#solo se usa si la variable de entorno CACHE_LABERINTOS dice en que directorio guardarlos
+cache_resultados = CacheResultados(directorio=os.environ.get('CACHE_LABERINTOS') or None)
+
+
+#el menu solo corre al ejecutar el archivo, asi se puede importar (y los procesos del pool no lo repiten)
+# python BFS_DFS.py --verificar      revisa que el cache de resultados regrese lo mismo que la busqueda
+if __name__ == "__main__" and sys.argv[1:] == ["--verificar"]:
+    errores = verificar_cache_resultados()
+    print(f"Casos del cache con error: {errores or 'ninguno'}")
+elif __name__ == "__main__":
+    ejecutando = True
+    while ejecutando:
+        print("\n=== Menú Principal ===")
+        print("1) Resolver con BFS")
+        print("2) Resolver con DFS")
+        print("3) Resolver con UCS")
+        print("4) A* con heurística Manhattan")
+        print("5) A* con heurística Euclidiana")
+        print("6) Cambiar laberinto (ruta de archivo)")
+        print("7) Salir")
+        print("8) BFS bidireccional")
+        print("9) UCS bidireccional")
+        print("10) Guardar laberinto en formato binario")
  
-    opcion = input("Elige una opción: ")
+        opcion = input("Elige una opción: ")
 
-    if opcion == '1':
-        ejecutar(bfs, "BFS")
+        if opcion == '1':
+            ejecutar(bfs, "BFS")
 
-    elif opcion == '2':
-        ejecutar(dfs, "DFS")
+        elif opcion == '2':
+            ejecutar(dfs, "DFS")
         
-    elif opcion == '3':
-        ejecutar(ucs, "UCS")
+        elif opcion == '3':
+            ejecutar(ucs, "UCS")
 
-    elif opcion == '4':
-        ejecutar_astar(heuristica_manhattan, "Manhattan")
+        elif opcion == '4':
+            ejecutar_astar(heuristica_manhattan, "Manhattan")
 
-    elif opcion == '5':
-        ejecutar_astar(heuristica_euclidiana, "Euclidiana")
+        elif opcion == '5':
+            ejecutar_astar(heuristica_euclidiana, "Euclidiana")
         
-    elif opcion =='6':
-        ruta = input("Ruta del archivo: ")
-        try:
-             with open(ruta, 'r') as f:
-                 laberinto_actual = f.read().strip()
-             print("Laberinto cargado correctamente.")
-        except:
-            print("Error al leer el archivo.")
-
-    elif opcion == '7':
-        print("Saliendo...")
-        ejecutando = False
-
-    else:
-        print("Opción inválida.")
+        elif opcion =='6':
+            ruta = input("Ruta del archivo: ")
+            try:
+                laberinto_actual = abrir_laberinto(ruta)
+                print("Laberinto cargado correctamente.")
+            except:
+                print("Error al leer el archivo.")
+
+        elif opcion == '7':
+            print("Saliendo...")
+            ejecutando = False
+
+        elif opcion == '8':
+            ejecutar(bfs_bidireccional, "BFS bidireccional")
+
+        elif opcion == '9':
+            ejecutar(ucs_bidireccional, "UCS bidireccional")
+
+        elif opcion == '10':
+            ruta = input("Ruta del archivo binario: ")
+            compresion = input("Compresion (ninguna, rle, zlib): ").strip().lower()
+            try:
+                guardar_laberinto_binario(laberinto_actual, ruta, None if compresion in ('', 'ninguna') else compresion)
+                print("Laberinto guardado correctamente.")
+            except (OSError, ValueError) as e:
+                print(f"Error al guardar el archivo: {e}")
+
+        else:
+            print("Opción inválida.")
@@ -1,187 +1,127 @@
 import time
 import heapq
-from collections import deque
+from array import array
 import math
 
-RESET = "\033[0m"
-GREEN = "\033[92m"
-RED = "\033[91m"
-YELLOW = "\033[93m"
-GRAY = "\033[90m"
-BLUE = "\033[94m"
-
-LABERINTO_DEFAULT = """
-###################
-#S..,,..........#G#
-#.###.###########.#
-#...#.......,,,,..#
-#.#.#.#########.#.#
-#.#.#.....~~~~~.#.#
-#.#.###########.#.#
-#.#.............#.#
-#.###############.#
-#.................#
-###################
-""".strip("\n")
-
-
-def cargar_laberinto(texto):
-    return [list(fila) for fila in texto.splitlines()]
-
-
-def encontrar_posicion(laberinto, simbolo):
-    for i, fila in enumerate(laberinto):
-        for j, celda in enumerate(fila):
-            if celda == simbolo:
-                return (i, j)
-    return None
-
-
-def vecinos(laberinto, pos):
-    x, y = pos
-    movimientos = [(-1,0), (1,0), (0,-1), (0,1)]
-    for dx, dy in movimientos:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < len(laberinto) and 0 <= ny < len(laberinto[0]):
-            if laberinto[nx][ny] != '#':
-                yield (nx, ny)
-
-
-def costo_celda(laberinto, pos):
-    x, y = pos
-    simbolo = laberinto[x][y]
-
-    if simbolo == 'S' or simbolo == 'G':
-        return 0
-    elif simbolo == '.':
-        return 1
-    elif simbolo == ',':
-        return 5
-    elif simbolo == '~':
-        return 10
-    else:
-        return float('inf')
-    
-
-
-def costo_camino(laberinto, camino): 
-    if not camino:
-        return float('inf')
-
-    total = 0
-    for pos in camino:
-        total += costo_celda(laberinto, pos)
-    return total
-
 
-def heuristica_manhattan(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-
-def heuristica_euclidiana(a, b):
-    return math.sqrt((a[0] - b[0])**2 + (a[1] - b[1])**2)
+#la rejilla, el precalculo y las funciones de apoyo son las de BFS_DFS.py, asi no hay dos copias
+from BFS_DFS import (RESET, GREEN, RED, YELLOW, GRAY, COSTO_INFINITO, LABERINTO_DEFAULT,
+                     Grid, cargar_laberinto, encontrar_posicion, precalcular, vecinos,
+                     costo_celda, costo_camino, heuristica_manhattan, heuristica_euclidiana,
+                     reconstruir_camino)
 
 
 def ucs(laberinto):
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
+    inicio = laberinto.indice(encontrar_posicion(laberinto, 'S'))
+    meta = laberinto.indice(encontrar_posicion(laberinto, 'G'))
+
+    precalcular(laberinto)
+    mascaras = laberinto.mascaras
+    salidas = laberinto.salidas
+    costo_de = laberinto.costos
 
+    total = len(laberinto.celdas)
     cola = []
     heapq.heappush(cola, (0, inicio))
 
-    costos = {inicio: 0}
-    padre = {}
-    visitados = set()
+    costos = [math.inf] * total
+    costos[inicio] = 0
+    padre = array('i', [-1]) * total
+    visitados = bytearray(total)
     nodos_visitados = 0
 
     while cola:
         costo_actual, actual = heapq.heappop(cola)
 
-        if actual in visitados:
+        if visitados[actual]:
             continue
 
-        visitados.add(actual)
+        visitados[actual] = 1
         nodos_visitados += 1
 
         if actual == meta:
             break
 
-        for v in vecinos(laberinto, actual):
-            nuevo_costo = costo_actual + costo_celda(laberinto, v)
+        for d in salidas[mascaras[actual]]:
+            v = actual + d
+            costo_v = costo_de[v]
+            if costo_v == COSTO_INFINITO:
+                continue
+            nuevo_costo = costo_actual + costo_v
 
-            if v not in costos or nuevo_costo < costos[v]:
+            if nuevo_costo < costos[v]:
                 costos[v] = nuevo_costo
                 padre[v] = actual
                 heapq.heappush(cola, (nuevo_costo, v))
 
-    camino = []
-    actual = meta
-    while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
-            return None, nodos_visitados, float('inf')
-    camino.append(inicio)
-    camino.reverse()
+    camino = reconstruir_camino(laberinto, padre, inicio, meta)
+    if camino is None:
+        return None, nodos_visitados, float('inf')
 
     return camino, nodos_visitados, costos[meta]
 
 
 def astar(laberinto, heuristica):
-    inicio = encontrar_posicion(laberinto, 'S')
-    meta = encontrar_posicion(laberinto, 'G')
+    inicio = laberinto.indice(encontrar_posicion(laberinto, 'S'))
+    meta_pos = encontrar_posicion(laberinto, 'G')
+    meta = laberinto.indice(meta_pos)
+
+    precalcular(laberinto)
+    mascaras = laberinto.mascaras
+    salidas = laberinto.salidas
+    costo_de = laberinto.costos
 
+    total = len(laberinto.celdas)
     abiertos = [] #es el arreglo de los nodos sin vis
     heapq.heappush(abiertos, (0, inicio)) #cola de prioridad 
 
-    g_costos = {inicio: 0}
-    padre = {}
-    cerrados = set() # no repetir nodos 
+    g_costos = [math.inf] * total
+    g_costos[inicio] = 0
+    padre = array('i', [-1]) * total
+    cerrados = bytearray(total) # no repetir nodos 
     nodos_visitados = 0
 
     while abiertos:
         _, actual = heapq.heappop(abiertos)
 
-        if actual in cerrados:
+        if cerrados[actual]:
             continue
 
-        cerrados.add(actual)
+        cerrados[actual] = 1
         nodos_visitados += 1
 
         if actual == meta:
             break
 
-        for v in vecinos(laberinto, actual):
-            nuevo_g = g_costos[actual] + costo_celda(laberinto, v)
+        for d in salidas[mascaras[actual]]:
+            v = actual + d
+            costo_v = costo_de[v]
+            if costo_v == COSTO_INFINITO:
+                continue
+            nuevo_g = g_costos[actual] + costo_v
 
-            if v in cerrados and nuevo_g >= g_costos.get(v, float('inf')): 
+            if cerrados[v] and nuevo_g >= g_costos[v]: 
                 continue
 
-            if nuevo_g < g_costos.get(v, float('inf')):
+            if nuevo_g < g_costos[v]:
                 padre[v] = actual
                 g_costos[v] = nuevo_g
-                f = nuevo_g + heuristica(v, meta) #g es costo acumulado v donde nos encontramos y y la direccion de la meta 
+                f = nuevo_g + heuristica(laberinto.posicion(v), meta_pos) #g es costo acumulado v donde nos encontramos y y la direccion de la meta 
                 heapq.heappush(abiertos, (f, v)) #ordenar por menor 
 
-    camino = []
-    actual = meta
-    while actual != inicio:
-        camino.append(actual)
-        actual = padre.get(actual)
-        if actual is None:
-            return None, nodos_visitados, float('inf')
-    camino.append(inicio)
-    camino.reverse()
+    camino = reconstruir_camino(laberinto, padre, inicio, meta)
+    if camino is None:
+        return None, nodos_visitados, float('inf')
 
     return camino, nodos_visitados, g_costos[meta]
 
 
 def mostrar_laberinto(laberinto, camino):
-    camino_set = set(camino) if camino else set()
+    camino_set = set(laberinto.indice(pos) for pos in camino) if camino else set()
 
-    for i, fila in enumerate(laberinto):
+    for i, fila in enumerate(laberinto.filas()):
         for j, celda in enumerate(fila):
-            pos = (i, j)
+            pos = i * laberinto.paso_fila + j
             if celda == 'S':
                 print(YELLOW + 'S' + RESET, end='')
             elif celda == 'G':
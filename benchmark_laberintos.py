@@ -0,0 +1,251 @@
+import argparse
+import csv
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from BFS_DFS import (cargar_laberinto, obtener_solver, obtener_componentes, costo_camino,
+                     bfs, dfs, ucs, astar, jps, heuristica_manhattan, heuristica_euclidiana)
+
+#benchmark de los algoritmos sobre laberintos generados: cada corrida llama al algoritmo
+#directo (sin cache de resultados ni animacion) y mide solo la busqueda
+
+#mezcla de terrenos por omision: simbolo -> peso al elegir el terreno de una celda libre
+TERRENOS_DEFAULT = {'.': 0.7, ',': 0.2, '~': 0.1}
+
+#los algoritmos sin costo (bfs, dfs) regresan 2 valores, su costo se calcula con costo_camino
+ALGORITMOS = {
+    'bfs': lambda lab: bfs(lab),
+    'dfs': lambda lab: dfs(lab),
+    'ucs': lambda lab: ucs(lab),
+    'astar_manhattan': lambda lab: astar(lab, heuristica_manhattan),
+    'astar_euclidiana': lambda lab: astar(lab, heuristica_euclidiana),
+    'jps': lambda lab: jps(lab),
+}
+
+COLUMNAS = ['tipo', 'filas', 'columnas', 'densidad', 'semilla', 'algoritmo', 'repeticiones',
+            'mediana_ms', 'p95_ms', 'nodos', 'memoria_preparacion_bytes', 'memoria_pico_bytes',
+            'costo', 'longitud']
+
+
+def elegir_terreno(rng, terrenos):
+    return rng.choices(list(terrenos), weights=list(terrenos.values()))[0]
+
+
+def poner_extremos(rejilla):
+    #'S' arriba a la izquierda y 'G' abajo a la derecha, siempre dentro del borde
+    rejilla[1][1] = 'S'
+    rejilla[-2][-2] = 'G'
+    return '\n'.join(''.join(fila) for fila in rejilla)
+
+
+#backtracker recursivo (con pila) sobre las celdas impares: da un laberinto perfecto, un solo
+#camino entre cada par de celdas. densidad es la fraccion de paredes interiores que se quedan,
+#con densidad < 1 se tiran paredes al azar y aparecen ciclos
+def generar_backtracker(filas, columnas, densidad=1.0, terrenos=TERRENOS_DEFAULT, semilla=0):
+    rng = random.Random(semilla)
+    filas = filas if filas % 2 else filas + 1
+    columnas = columnas if columnas % 2 else columnas + 1
+    rejilla = [['#'] * columnas for _ in range(filas)]
+    rejilla[1][1] = elegir_terreno(rng, terrenos)
+    pila = [(1, 1)]
+    while pila:
+        f, c = pila[-1]
+        vecinos = [(f + df, c + dc, f + df // 2, c + dc // 2)
+                   for df, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 < f + df < filas - 1 and 0 < c + dc < columnas - 1 and rejilla[f + df][c + dc] == '#']
+        if not vecinos:
+            pila.pop()
+            continue
+        nf, nc, pf, pc = rng.choice(vecinos)
+        rejilla[pf][pc] = elegir_terreno(rng, terrenos)
+        rejilla[nf][nc] = elegir_terreno(rng, terrenos)
+        pila.append((nf, nc))
+
+    if densidad < 1:
+        for f in range(1, filas - 1):
+            for c in range(1, columnas - 1):
+                if rejilla[f][c] == '#' and (f % 2 == 1 or c % 2 == 1) and rng.random() > densidad:
+                    rejilla[f][c] = elegir_terreno(rng, terrenos)
+    return poner_extremos(rejilla)
+
+
+#cada celda interior es pared con probabilidad densidad; puede quedar sin solucion
+def generar_relleno(filas, columnas, densidad=0.25, terrenos=TERRENOS_DEFAULT, semilla=0):
+    rng = random.Random(semilla)
+    rejilla = [['#'] * columnas for _ in range(filas)]
+    for f in range(1, filas - 1):
+        for c in range(1, columnas - 1):
+            rejilla[f][c] = '#' if rng.random() < densidad else elegir_terreno(rng, terrenos)
+    return poner_extremos(rejilla)
+
+
+#campo abierto: sin paredes interiores, solo manchas de terreno; densidad es la fraccion de
+#celdas que se siembran con terreno distinto de '.' y crecen a sus vecinas
+def generar_campo_abierto(filas, columnas, densidad=0.05, terrenos=TERRENOS_DEFAULT, semilla=0):
+    rng = random.Random(semilla)
+    rejilla = [['#'] * columnas for _ in range(filas)]
+    for f in range(1, filas - 1):
+        for c in range(1, columnas - 1):
+            rejilla[f][c] = '.'
+    pesados = {s: p for s, p in terrenos.items() if s != '.'} or terrenos
+    for _ in range(int(densidad * (filas - 2) * (columnas - 2))):
+        f = rng.randrange(1, filas - 1)
+        c = rng.randrange(1, columnas - 1)
+        simbolo = elegir_terreno(rng, pesados)
+        for df in range(-2, 3):
+            for dc in range(-2, 3):
+                if 0 < f + df < filas - 1 and 0 < c + dc < columnas - 1 and rng.random() < 0.6:
+                    rejilla[f + df][c + dc] = simbolo
+    return poner_extremos(rejilla)
+
+
+GENERADORES = {
+    'backtracker': generar_backtracker,
+    'relleno': generar_relleno,
+    'abierto': generar_campo_abierto,
+}
+
+#la densidad significa algo distinto en cada generador, sin densidades se usan estas.
+#en campo abierto van varias: casi sin terreno, terreno disperso (donde JPS salta solo en
+#parte del mapa) y terreno en casi todos lados
+DENSIDADES_DEFAULT = {'backtracker': [0.9], 'relleno': [0.25], 'abierto': [0.001, 0.005, 0.05]}
+
+
+#regresa (descripcion, texto) para cada combinacion de tipo, tamano y densidad
+def generar_corpus(tipos, tamanos, densidades=None, terrenos=TERRENOS_DEFAULT, semilla=0):
+    corpus = []
+    for tipo in tipos:
+        for tamano in tamanos:
+            for densidad in densidades or DENSIDADES_DEFAULT[tipo]:
+                texto = GENERADORES[tipo](tamano, tamano, densidad, terrenos, semilla)
+                lineas = texto.splitlines()
+                descripcion = {'tipo': tipo, 'filas': len(lineas), 'columnas': len(lineas[0]),
+                               'densidad': densidad, 'semilla': semilla}
+                corpus.append((descripcion, texto))
+    return corpus
+
+
+def percentil(valores, p):
+    #percentil por rango mas cercano
+    ordenados = sorted(valores)
+    posicion = max(0, min(len(ordenados) - 1, -(-len(ordenados) * p // 100) - 1))
+    return ordenados[int(posicion)]
+
+
+#pico de memoria de cargar el laberinto y armar todo lo que comparten las consultas: costos y
+#mascaras de precalcular, los arreglos del Solver y las etiquetas de componentes. es la mayor
+#parte de la memoria y no depende del algoritmo, por eso se mide una vez por laberinto
+def medir_preparacion(texto):
+    tracemalloc.start()
+    laberinto = cargar_laberinto(texto)
+    obtener_solver(laberinto)
+    obtener_componentes(laberinto)
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return laberinto, memoria_pico
+
+
+def medir(laberinto, algoritmo, calentamiento=1, repeticiones=5):
+    if repeticiones < 1:
+        raise ValueError("Se necesita al menos una repeticion")
+    funcion = ALGORITMOS[algoritmo]
+    #el calentamiento arma el Solver, las tablas precalculadas y las componentes
+    obtener_solver(laberinto)
+    obtener_componentes(laberinto)
+    for _ in range(calentamiento):
+        funcion(laberinto)
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(laberinto)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    #la memoria se mide en una corrida aparte, tracemalloc hace mas lenta la busqueda.
+    #es solo lo que reserva la consulta, la preparacion va en medir_preparacion
+    tracemalloc.start()
+    funcion(laberinto)
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    camino, nodos = resultado[0], resultado[1]
+    costo = resultado[2] if len(resultado) > 2 else costo_camino(laberinto, camino)
+    return {
+        'algoritmo': algoritmo,
+        'repeticiones': repeticiones,
+        'mediana_ms': round(statistics.median(tiempos), 4),
+        'p95_ms': round(percentil(tiempos, 95), 4),
+        'nodos': nodos,
+        'memoria_pico_bytes': memoria_pico,
+        'costo': costo if camino else None,
+        'longitud': len(camino) - 1 if camino else None,
+    }
+
+
+def correr_benchmark(corpus, algoritmos=tuple(ALGORITMOS), calentamiento=1, repeticiones=5, salida=None):
+    filas = []
+    for descripcion, texto in corpus:
+        laberinto, memoria_preparacion = medir_preparacion(texto)
+        for algoritmo in algoritmos:
+            fila = dict(descripcion)
+            fila['memoria_preparacion_bytes'] = memoria_preparacion
+            fila.update(medir(laberinto, algoritmo, calentamiento, repeticiones))
+            filas.append(fila)
+            if salida is not None:
+                salida.write(f"{fila['tipo']} {fila['filas']}x{fila['columnas']} d={fila['densidad']} "
+                             f"{algoritmo}: {fila['mediana_ms']:.2f} ms (p95 {fila['p95_ms']:.2f}), "
+                             f"{fila['nodos']} nodos, costo {fila['costo']}\n")
+                salida.flush()
+    return filas
+
+
+def guardar_csv(filas, ruta):
+    with open(ruta, 'w', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def guardar_json(filas, ruta):
+    with open(ruta, 'w') as archivo:
+        json.dump(filas, archivo, indent=2)
+
+
+def entero_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError("tiene que ser al menos 1")
+    return valor
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de BFS, DFS, UCS, A* y JPS sobre laberintos generados")
+    parser.add_argument('--tipos', nargs='+', default=list(GENERADORES), choices=list(GENERADORES))
+    parser.add_argument('--tamanos', nargs='+', type=int, default=[51, 101, 201])
+    parser.add_argument('--densidades', nargs='+', type=float, default=None)
+    parser.add_argument('--terrenos', default=None,
+                        help="mezcla de terrenos como JSON, por ejemplo '{\".\": 0.8, \"~\": 0.2}'")
+    parser.add_argument('--algoritmos', nargs='+', default=list(ALGORITMOS), choices=list(ALGORITMOS))
+    parser.add_argument('--calentamiento', type=int, default=1)
+    parser.add_argument('--repeticiones', type=entero_positivo, default=5)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--csv', dest='ruta_csv', default=None)
+    parser.add_argument('--json', dest='ruta_json', default=None)
+    args = parser.parse_args(argumentos)
+
+    terrenos = json.loads(args.terrenos) if args.terrenos else TERRENOS_DEFAULT
+    corpus = generar_corpus(args.tipos, args.tamanos, args.densidades, terrenos, args.semilla)
+    filas = correr_benchmark(corpus, args.algoritmos, args.calentamiento, args.repeticiones, sys.stdout)
+    if args.ruta_csv:
+        guardar_csv(filas, args.ruta_csv)
+    if args.ruta_json:
+        guardar_json(filas, args.ruta_json)
+    return filas
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
 import math
+import os
+import random
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor #busqueda en paralelo del motor mnk
 
 def imprimir_tablero(tablero):
 
@@ -34,6 +40,48 @@ def verificar_ganador(tablero):
 
 
 
+# ==============================
+# Tabla de transposicion
+# ==============================
+
+# Las 8 simetrias del tablero (4 rotaciones y sus reflejos),
+# simetria[i] es la casilla del tablero original que queda en la casilla i
+SIMETRIAS = [
+    (0,1,2,3,4,5,6,7,8),
+    (6,3,0,7,4,1,8,5,2),
+    (8,7,6,5,4,3,2,1,0),
+    (2,5,8,1,4,7,0,3,6),
+    (2,1,0,5,4,3,8,7,6),
+    (0,3,6,1,4,7,2,5,8),
+    (6,7,8,3,4,5,0,1,2),
+    (8,5,2,7,4,1,6,3,0)
+]
+
+VALOR_CASILLA = {" ": 0, "X": 1, "O": 2}
+
+EXACTO = 0
+COTA_INFERIOR = 1
+COTA_SUPERIOR = 2
+
+# llave -> (valor, tipo). El valor de una posicion no depende de como se llego a ella,
+# asi que la tabla se guarda entre turnos y entre partidas
+tabla_transposicion = {}
+
+
+def codificar(tablero, simetria=SIMETRIAS[0]):
+    # el tablero como numero en base 3, casilla 0 en la cifra menos significativa
+    codigo = 0
+    for i in reversed(simetria):
+        codigo = codigo * 3 + VALOR_CASILLA[tablero[i]]
+    return codigo
+
+
+def llave_tablero(tablero, es_maximizador):
+    # las posiciones simetricas valen lo mismo, todas comparten la llave del menor codigo
+    codigo = min(codificar(tablero, simetria) for simetria in SIMETRIAS)
+    return codigo * 2 + (1 if es_maximizador else 0)
+
+
 # ==============================
 # Minimax con Poda Alfa-Beta
 # ==============================
@@ -48,6 +96,23 @@ def minimax(tablero, es_maximizador, alpha, beta):
     elif resultado == "Empate":
         return 0
 
+    # Si la posicion ya se busco, el valor guardado sirve directo o al menos cierra la ventana
+    llave = llave_tablero(tablero, es_maximizador)
+    entrada = tabla_transposicion.get(llave)
+    if entrada is not None:
+        valor, tipo = entrada
+        if tipo == EXACTO:
+            return valor
+        elif tipo == COTA_INFERIOR:
+            alpha = max(alpha, valor)
+        else:
+            beta = min(beta, valor)
+        if beta <= alpha:
+            return valor
+
+    alpha_inicial = alpha
+    beta_inicial = beta
+
     if es_maximizador:
         mejor = -math.inf
 
@@ -63,8 +128,6 @@ def minimax(tablero, es_maximizador, alpha, beta):
                 if beta <= alpha:
                     break
 
-        return mejor
-
     else:
         mejor = math.inf
 
@@ -81,7 +144,16 @@ def minimax(tablero, es_maximizador, alpha, beta):
                 if beta <= alpha:
                     break
 
-        return mejor
+    # Fuera de la ventana el resultado solo es una cota del valor real
+    if mejor <= alpha_inicial:
+        tipo = COTA_SUPERIOR
+    elif mejor >= beta_inicial:
+        tipo = COTA_INFERIOR
+    else:
+        tipo = EXACTO
+    tabla_transposicion[llave] = (mejor, tipo)
+
+    return mejor
 
 
 def mejor_movimiento(tablero):
@@ -96,8 +168,8 @@ def mejor_movimiento(tablero):
             # Simulamos jugada
             tablero[posicion] = "O"
 
-            # Evaluamos
-            resultado = minimax(tablero, False, -math.inf, math.inf)
+            # Evaluamos, solo interesa si supera al mejor que ya tenemos
+            resultado = minimax(tablero, False, mejor_valor, math.inf)
 
             # Deshacemos jugada
             tablero[posicion] = " "
@@ -107,10 +179,509 @@ def mejor_movimiento(tablero):
                 mejor_valor = resultado
                 mejor_posicion = posicion
 
+            # Ganar es lo mejor posible, no hace falta ver mas jugadas
+            if mejor_valor == 1:
+                break
+
     return mejor_posicion
 
 
 
+# ==============================
+# Motor con bitboards (m x n, k en linea)
+# ==============================
+
+# Cada jugador es un entero con un bit por casilla (casilla = fila * columnas + columna).
+# Las lineas ganadoras se calculan una vez por tamano de tablero, asi revisar si alguien
+# gano despues de una jugada es probar solo las lineas que pasan por esa casilla.
+# Los valores son desde el punto de vista del que mueve (negamax): ganar vale GANAR menos
+# las jugadas que faltan, asi se prefiere ganar rapido y perder tarde.
+
+GANAR = 1000000
+
+
+class TiempoAgotado(Exception):
+    pass
+
+
+class MotorMNK:
+    def __init__(self, filas=3, columnas=3, k=3):
+        if k > max(filas, columnas):
+            raise ValueError("k no cabe en el tablero")
+        self.filas = filas
+        self.columnas = columnas
+        self.k = k
+        self.casillas = filas * columnas
+        self.lleno = (1 << self.casillas) - 1
+
+        self.lineas = []
+        self.lineas_de = [[] for _ in range(self.casillas)]
+        for fila in range(filas):
+            for columna in range(columnas):
+                for df, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    fila_final = fila + df * (k - 1)
+                    columna_final = columna + dc * (k - 1)
+                    if fila_final >= filas or columna_final < 0 or columna_final >= columnas:
+                        continue
+                    celdas = [(fila + df * i) * columnas + columna + dc * i for i in range(k)]
+                    linea = 0
+                    for celda in celdas:
+                        linea |= 1 << celda
+                    self.lineas.append(linea)
+                    for celda in celdas:
+                        self.lineas_de[celda].append(linea)
+
+        # sin otra informacion se prueban primero las casillas cercanas al centro
+        centro_fila = (filas - 1) / 2
+        centro_columna = (columnas - 1) / 2
+        self.orden = sorted(range(self.casillas),
+                            key=lambda c: abs(c // columnas - centro_fila) + abs(c % columnas - centro_columna))
+        # lugar de cada casilla en self.orden, desempata las jugadas de la raiz con el mismo valor
+        self.rango = [0] * self.casillas
+        for lugar, casilla in enumerate(self.orden):
+            self.rango[casilla] = lugar
+
+        # una linea con n piezas de un solo jugador vale PESOS[n] para ese jugador
+        self.pesos = [0] + [4 ** n for n in range(1, k + 1)]
+
+        self.tabla = {}   # (propias, ajenas) -> (profundidad, valor, tipo, jugada)
+        self.historia = [0] * self.casillas
+        self.nodos = 0
+        self.limite = None
+        self.pool = None  # procesos de mejor_jugada_paralela, se crean la primera vez
+
+    def desde_tablero(self, tablero, jugador="O"):
+        # tablero como lista de " "/"X"/"O", regresa (propias, ajenas) para jugador
+        propias = 0
+        ajenas = 0
+        for i, simbolo in enumerate(tablero):
+            if simbolo == jugador:
+                propias |= 1 << i
+            elif simbolo != " ":
+                ajenas |= 1 << i
+        return propias, ajenas
+
+    def gana(self, piezas, casilla):
+        for linea in self.lineas_de[casilla]:
+            if piezas & linea == linea:
+                return True
+        return False
+
+    def ganador(self, piezas):
+        for linea in self.lineas:
+            if piezas & linea == linea:
+                return True
+        return False
+
+    def evaluar(self, propias, ajenas):
+        # suma de las lineas que todavia puede completar cada jugador
+        valor = 0
+        pesos = self.pesos
+        for linea in self.lineas:
+            if linea & ajenas == 0:
+                valor += pesos[bin(linea & propias).count("1")]
+            elif linea & propias == 0:
+                valor -= pesos[bin(linea & ajenas).count("1")]
+        return valor
+
+    def jugadas(self, propias, ajenas, primera=None):
+        ocupadas = propias | ajenas
+        libres = [c for c in self.orden if not ocupadas >> c & 1]
+        historia = self.historia
+        libres.sort(key=lambda c: -historia[c])
+        if primera is not None and primera in libres:
+            libres.remove(primera)
+            libres.insert(0, primera)
+        return libres
+
+    def negamax(self, propias, ajenas, profundidad, alpha, beta, ply):
+        self.nodos += 1
+        if self.limite is not None and self.nodos % 1024 == 0 and time.perf_counter() > self.limite:
+            raise TiempoAgotado()
+        if propias | ajenas == self.lleno:
+            return 0
+        if profundidad == 0:
+            return self.evaluar(propias, ajenas)
+
+        # los valores de ganar se guardan relativos a este nodo y no a la raiz
+        llave = (propias, ajenas)
+        entrada = self.tabla.get(llave)
+        primera = None
+        if entrada is not None:
+            profundidad_guardada, valor, tipo, primera = entrada
+            if valor > GANAR - self.casillas:
+                valor -= ply
+            elif valor < -GANAR + self.casillas:
+                valor += ply
+            # solo corta con una entrada de la misma profundidad: una mas profunda (de la jugada
+            # anterior) daria otro valor segun que hay en la tabla, y la busqueda en paralelo,
+            # con otra tabla en cada proceso, ya no elegiria la misma jugada que la secuencial
+            if profundidad_guardada == profundidad:
+                if tipo == EXACTO:
+                    return valor
+                elif tipo == COTA_INFERIOR:
+                    alpha = max(alpha, valor)
+                else:
+                    beta = min(beta, valor)
+                if beta <= alpha:
+                    return valor
+
+        alpha_inicial = alpha
+        mejor = -math.inf
+        mejor_jugada = None
+        for casilla in self.jugadas(propias, ajenas, primera):
+            nuevas = propias | (1 << casilla)
+            if self.gana(nuevas, casilla):
+                valor = GANAR - ply - 1
+            else:
+                valor = -self.negamax(ajenas, nuevas, profundidad - 1, -beta, -alpha, ply + 1)
+            if valor > mejor:
+                mejor = valor
+                mejor_jugada = casilla
+            alpha = max(alpha, mejor)
+            if beta <= alpha:
+                self.historia[casilla] += profundidad * profundidad
+                break
+
+        if mejor <= alpha_inicial:
+            tipo = COTA_SUPERIOR
+        elif mejor >= beta:
+            tipo = COTA_INFERIOR
+        else:
+            tipo = EXACTO
+        guardado = mejor
+        if guardado > GANAR - self.casillas:
+            guardado += ply
+        elif guardado < -GANAR + self.casillas:
+            guardado -= ply
+        self.tabla[llave] = (profundidad, guardado, tipo, mejor_jugada)
+        return mejor
+
+    def buscar_raiz(self, propias, ajenas, profundidad, alpha=-math.inf, beta=math.inf, jugadas=None):
+        # regresa (jugada, valor) buscando a esa profundidad. se busca con alpha - 1 para que una
+        # jugada que empata con la mejor salga con su valor exacto; los empates se quedan con la
+        # primera en self.orden, asi la jugada no depende del orden en que se buscaron
+        if jugadas is None:
+            entrada = self.tabla.get((propias, ajenas))
+            jugadas = self.jugadas(propias, ajenas, entrada[3] if entrada else None)
+        rango = self.rango
+        mejor = -math.inf
+        mejor_jugada = None
+        for casilla in jugadas:
+            nuevas = propias | (1 << casilla)
+            if self.gana(nuevas, casilla):
+                valor = GANAR - 1
+            else:
+                valor = -self.negamax(ajenas, nuevas, profundidad - 1, -beta, 1 - max(alpha, mejor), 1)
+            if valor > mejor or (valor == mejor and rango[casilla] < rango[mejor_jugada]):
+                mejor = valor
+                mejor_jugada = casilla
+            if mejor >= beta:
+                break
+        return mejor_jugada, mejor
+
+    def mejor_jugada(self, propias, ajenas, profundidad_maxima=None, tiempo=None):
+        # profundizacion iterativa: cada vuelta deja en la tabla la mejor jugada de cada
+        # posicion y la siguiente la prueba primero. con tiempo (segundos) regresa lo de la
+        # ultima profundidad terminada; la profundidad 1 siempre se termina
+        libres = self.casillas - bin(propias | ajenas).count("1")
+        if libres == 0:
+            return None, 0
+        if profundidad_maxima is None or profundidad_maxima > libres:
+            profundidad_maxima = libres
+        inicio = time.perf_counter()
+        self.nodos = 0
+        resultado = None
+        for profundidad in range(1, profundidad_maxima + 1):
+            self.limite = None if tiempo is None or resultado is None else inicio + tiempo
+            try:
+                resultado = self.buscar_raiz(propias, ajenas, profundidad)
+            except TiempoAgotado:
+                break
+            # ya se sabe quien gana, buscar mas profundo no cambia la jugada
+            if abs(resultado[1]) > GANAR - self.casillas:
+                break
+            if tiempo is not None and time.perf_counter() > inicio + tiempo:
+                break
+        self.limite = None
+        return resultado
+
+    # ---- busqueda en paralelo por jugadas de la raiz ----
+    # Cada proceso tiene su propio MotorMNK (y su propia tabla) y busca una jugada de la raiz
+    # completa. Como en Young Brothers Wait la primera jugada se busca sola y las demas ya
+    # arrancan con su valor como alpha; ese alpha esta en memoria compartida y cada proceso lo
+    # sube al terminar, asi las jugadas que empiezan despues cortan mas. Se busca con alpha - 1
+    # para que una jugada que empata con la mejor tambien salga con valor exacto y se elija
+    # igual que en buscar_raiz: la primera en self.orden con el mayor valor. Despues del limite
+    # de tiempo las tareas que faltan ya no arrancan ni leen el alpha compartido.
+
+    def procesos_busqueda(self, procesos=None):
+        if self.pool is None:
+            self.alpha_compartido = multiprocessing.Value("d", -math.inf)
+            self.pool = ProcessPoolExecutor(max_workers=procesos or os.cpu_count(),
+                                            initializer=_iniciar_proceso_mnk,
+                                            initargs=(self.filas, self.columnas, self.k, self.alpha_compartido))
+        return self.pool
+
+    def cerrar_procesos(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def buscar_raiz_paralela(self, propias, ajenas, profundidad, jugadas, limite_reloj=None, procesos=None):
+        pool = self.procesos_busqueda(procesos)
+        self.alpha_compartido.value = -math.inf
+        primera = pool.submit(_buscar_jugada_mnk, propias, ajenas, jugadas[0], profundidad, limite_reloj)
+        resultados = [primera.result()]
+        if resultados[0][1] is not None:
+            tareas = [pool.submit(_buscar_jugada_mnk, propias, ajenas, casilla, profundidad, limite_reloj)
+                      for casilla in jugadas[1:]]
+            for tarea in tareas:
+                resultados.append(tarea.result())
+                if resultados[-1][1] is None:
+                    # se acabo el tiempo, las que no han arrancado ya no se buscan
+                    for pendiente in tareas:
+                        pendiente.cancel()
+                    break
+
+        rango = self.rango
+        mejor = -math.inf
+        mejor_jugada = None
+        for casilla, valor, alpha_usado, nodos in resultados:
+            self.nodos += nodos
+            if valor is None:
+                raise TiempoAgotado()
+            # si no paso de alpha solo es una cota, y esa jugada no es mejor que otra ya vista
+            if valor > alpha_usado and (valor > mejor or (valor == mejor and rango[casilla] < rango[mejor_jugada])):
+                mejor = valor
+                mejor_jugada = casilla
+        return mejor_jugada, mejor
+
+    def mejor_jugada_paralela(self, propias, ajenas, profundidad_maxima=None, tiempo=None, procesos=None):
+        # igual que mejor_jugada pero cada profundidad reparte las jugadas de la raiz entre procesos;
+        # la profundidad 1 se busca aqui mismo y la mejor jugada de cada vuelta va primero en la siguiente
+        libres = self.casillas - bin(propias | ajenas).count("1")
+        if libres == 0:
+            return None, 0
+        if profundidad_maxima is None or profundidad_maxima > libres:
+            profundidad_maxima = libres
+        limite_reloj = None if tiempo is None else time.time() + tiempo
+        self.nodos = 0
+        resultado = self.buscar_raiz(propias, ajenas, 1)
+        for profundidad in range(2, profundidad_maxima + 1):
+            if abs(resultado[1]) > GANAR - self.casillas:
+                break
+            if limite_reloj is not None and time.time() > limite_reloj:
+                break
+            jugadas = self.jugadas(propias, ajenas, resultado[0])
+            try:
+                resultado = self.buscar_raiz_paralela(propias, ajenas, profundidad, jugadas, limite_reloj, procesos)
+            except TiempoAgotado:
+                break
+        return resultado
+
+
+# estado de cada proceso de la busqueda en paralelo
+motor_proceso = None
+alpha_proceso = None
+
+
+def _iniciar_proceso_mnk(filas, columnas, k, alpha_compartido):
+    global motor_proceso, alpha_proceso
+    motor_proceso = MotorMNK(filas, columnas, k)
+    alpha_proceso = alpha_compartido
+
+
+def _buscar_jugada_mnk(propias, ajenas, casilla, profundidad, limite_reloj):
+    # regresa (casilla, valor, alpha con el que se busco, nodos); valor es None si se acabo el tiempo
+    motor = motor_proceso
+    motor.nodos = 0
+    if limite_reloj is not None and time.time() > limite_reloj:
+        return casilla, None, -math.inf, 0
+    nuevas = propias | (1 << casilla)
+    if motor.gana(nuevas, casilla):
+        valor = GANAR - 1
+        alpha_usado = -math.inf
+    else:
+        alpha_usado = alpha_proceso.value - 1
+        if limite_reloj is not None:
+            motor.limite = time.perf_counter() + (limite_reloj - time.time())
+        try:
+            valor = -motor.negamax(ajenas, nuevas, profundidad - 1, -math.inf, -alpha_usado, 1)
+        except TiempoAgotado:
+            return casilla, None, alpha_usado, motor.nodos
+        finally:
+            motor.limite = None
+    with alpha_proceso.get_lock():
+        if valor > alpha_proceso.value:
+            alpha_proceso.value = valor
+    return casilla, valor, alpha_usado, motor.nodos
+
+
+# ==============================
+# Tabla de jugadas perfectas (3x3)
+# ==============================
+
+# El juego completo cabe en una tabla: para cada posicion canonica (el menor codigo entre
+# sus 8 simetrias) se guarda un byte con jugada * 3 + (valor + 1), donde la jugada es la mejor
+# casilla en la orientacion canonica para el que mueve y el valor es el de minimax (+1 gana O).
+# Como los codigos en base 3 son menores a 3^9 el archivo es un arreglo de un byte por codigo,
+# las posiciones que no existen o ya terminaron quedan en SIN_JUGADA.
+
+ARCHIVO_TABLA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gato.tabla")
+FIRMA_TABLA = b"GATO"
+TOTAL_CODIGOS = 3 ** 9
+SIN_JUGADA = 255
+
+tabla_gato = None
+
+
+def canonica(tablero):
+    # regresa (codigo, simetria) del menor codigo; la casilla i del tablero canonico
+    # es la casilla simetria[i] del tablero original
+    return min((codificar(tablero, simetria), simetria) for simetria in SIMETRIAS)
+
+
+def resolver_gato():
+    # recorre todas las posiciones a las que se puede llegar empezando X y resuelve cada una
+    tabla = bytearray([SIN_JUGADA]) * TOTAL_CODIGOS
+    pendientes = [[" "] * 9]
+    while pendientes:
+        tablero = pendientes.pop()
+        if verificar_ganador(tablero):
+            continue
+        codigo, simetria = canonica(tablero)
+        if tabla[codigo] != SIN_JUGADA:
+            continue
+        canonico = [tablero[i] for i in simetria]
+        turno_o = canonico.count("X") > canonico.count("O")
+
+        mejor_valor = None
+        mejor_jugada = None
+        for posicion in range(9):
+            if canonico[posicion] != " ":
+                continue
+            canonico[posicion] = "O" if turno_o else "X"
+            valor = minimax(canonico, not turno_o, -math.inf, math.inf)
+            siguiente = canonico[:]
+            canonico[posicion] = " "
+            pendientes.append(siguiente)
+            if mejor_valor is None or (valor > mejor_valor if turno_o else valor < mejor_valor):
+                mejor_valor = valor
+                mejor_jugada = posicion
+        tabla[codigo] = mejor_jugada * 3 + mejor_valor + 1
+    return tabla
+
+
+def guardar_tabla_gato(tabla, ruta=ARCHIVO_TABLA):
+    with open(ruta, "wb") as archivo:
+        archivo.write(FIRMA_TABLA + bytes(tabla))
+
+
+def cargar_tabla_gato(ruta=ARCHIVO_TABLA):
+    # se carga la primera vez que se pide; si no hay archivo (o no sirve) se genera y se guarda
+    global tabla_gato
+    if tabla_gato is not None:
+        return tabla_gato
+    try:
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        if datos[:4] != FIRMA_TABLA or len(datos) != 4 + TOTAL_CODIGOS:
+            raise ValueError("Archivo de tabla invalido")
+        tabla_gato = bytearray(datos[4:])
+    except (OSError, ValueError):
+        tabla_gato = resolver_gato()
+        try:
+            guardar_tabla_gato(tabla_gato, ruta)
+        except OSError:
+            pass
+    return tabla_gato
+
+
+def consultar_tabla(tablero):
+    # regresa (jugada, valor) para el que mueve, o None si la posicion no esta en la tabla
+    codigo, simetria = canonica(tablero)
+    entrada = cargar_tabla_gato()[codigo]
+    if entrada == SIN_JUGADA:
+        return None
+    return simetria[entrada // 3], entrada % 3 - 1
+
+
+def jugada_tabla(tablero):
+    consulta = consultar_tabla(tablero)
+    if consulta is None:
+        return mejor_movimiento(tablero)
+    return consulta[0]
+
+
+def verificar_contra_tabla():
+    # usa la tabla como oraculo: mejor_movimiento y MotorMNK tienen que conseguir el valor
+    # perfecto en cada posicion, regresa la lista de tableros donde no lo hacen
+    tabla = cargar_tabla_gato()
+    motor = MotorMNK(3, 3, 3)
+    errores = []
+    for codigo in range(TOTAL_CODIGOS):
+        entrada = tabla[codigo]
+        if entrada == SIN_JUGADA:
+            continue
+        tablero = []
+        resto = codigo
+        for _ in range(9):
+            tablero.append(" XO"[resto % 3])
+            resto //= 3
+        valor = entrada % 3 - 1
+        turno_o = tablero.count("X") > tablero.count("O")
+        jugadas = []
+        if turno_o:
+            jugadas.append(mejor_movimiento(tablero))
+        propias, ajenas = motor.desde_tablero(tablero, "O" if turno_o else "X")
+        jugadas.append(motor.mejor_jugada(propias, ajenas)[0])
+        for jugada in jugadas:
+            tablero[jugada] = "O" if turno_o else "X"
+            resultado = verificar_ganador(tablero)
+            if resultado == "O":
+                obtenido = 1
+            elif resultado == "X":
+                obtenido = -1
+            elif resultado == "Empate":
+                obtenido = 0
+            else:
+                obtenido = tabla[canonica(tablero)[0]] % 3 - 1
+            tablero[jugada] = " "
+            if obtenido != valor:
+                errores.append(tablero[:])
+    return errores
+
+
+def verificar_paralela(filas=4, columnas=4, k=3, posiciones=60, procesos=2, semilla=0):
+    # mejor_jugada y mejor_jugada_paralela tienen que elegir la misma jugada con el mismo valor
+    # en posiciones al azar (a profundidad fija), regresa las que no coinciden como (o, x, profundidad)
+    rng = random.Random(semilla)
+    secuencial = MotorMNK(filas, columnas, k)
+    paralelo = MotorMNK(filas, columnas, k)
+    errores = []
+    try:
+        for _ in range(posiciones):
+            casillas = rng.sample(range(secuencial.casillas), rng.randint(0, secuencial.casillas // 3))
+            x = 0
+            o = 0
+            for i, casilla in enumerate(casillas):
+                if i % 2 == 0:
+                    x |= 1 << casilla
+                else:
+                    o |= 1 << casilla
+            if secuencial.ganador(x) or secuencial.ganador(o):
+                continue
+            profundidad = rng.randint(2, 5)
+            esperado = secuencial.mejor_jugada(o, x, profundidad_maxima=profundidad)
+            obtenido = paralelo.mejor_jugada_paralela(o, x, profundidad_maxima=profundidad, procesos=procesos)
+            if esperado != obtenido:
+                errores.append((o, x, profundidad))
+    finally:
+        paralelo.cerrar_procesos()
+    return errores
+
+
 def jugar():
     while True:
         tablero = [" "] * 9
@@ -143,7 +714,7 @@ def jugar():
 
             # Turno IA
             print("\nMovimiento de la IA(O)\n")
-            movimiento = mejor_movimiento(tablero)
+            movimiento = jugada_tabla(tablero)
             tablero[movimiento] = "O"
 
             resultado = verificar_ganador(tablero)
@@ -164,4 +735,103 @@ def jugar():
                 print("Opción inválida.")
 
 
-jugar()
+def imprimir_mnk(motor, o, x):
+    for fila in range(motor.filas):
+        simbolos = []
+        for columna in range(motor.columnas):
+            casilla = fila * motor.columnas + columna
+            if o >> casilla & 1:
+                simbolos.append("O")
+            elif x >> casilla & 1:
+                simbolos.append("X")
+            else:
+                simbolos.append(" ")
+        print(" " + " | ".join(simbolos))
+        if fila < motor.filas - 1:
+            print("|".join(["---"] * motor.columnas))
+
+
+def jugar_mnk(filas, columnas, k, tiempo=2.0, procesos=None):
+    # partida contra el motor de bitboards, la IA piensa a lo mucho tiempo segundos por jugada;
+    # con procesos > 1 reparte la busqueda entre esos procesos
+    motor = MotorMNK(filas, columnas, k)
+    while True:
+        o = 0
+        x = 0
+        print(f"\n===== NUEVA PARTIDA {filas}x{columnas}, {k} en linea =====\n")
+
+        while True:
+            imprimir_mnk(motor, o, x)
+
+            # Turno jugador
+            while True:
+                try:
+                    pos = int(input(f"Elige una posición (1-{motor.casillas}): ")) - 1
+                    if pos < 0 or pos >= motor.casillas:
+                        print("Número inválido.")
+                        continue
+                    if (o | x) >> pos & 1:
+                        print("Casilla ocupada.")
+                        continue
+                    break
+                except ValueError:
+                    print("Entrada inválida.")
+
+            x |= 1 << pos
+            if motor.gana(x, pos):
+                imprimir_mnk(motor, o, x)
+                print("\nResultado: X")
+                break
+            if o | x == motor.lleno:
+                imprimir_mnk(motor, o, x)
+                print("\nResultado: Empate")
+                break
+
+            # Turno IA
+            print("\nMovimiento de la IA(O)\n")
+            if procesos is not None and procesos > 1:
+                movimiento, _ = motor.mejor_jugada_paralela(o, x, tiempo=tiempo, procesos=procesos)
+            else:
+                movimiento, _ = motor.mejor_jugada(o, x, tiempo=tiempo)
+            o |= 1 << movimiento
+            if motor.gana(o, movimiento):
+                imprimir_mnk(motor, o, x)
+                print("\nEl ganador es: O")
+                break
+            if o | x == motor.lleno:
+                imprimir_mnk(motor, o, x)
+                print("\nResultado: Empate")
+                break
+
+        opcion = ""
+        while opcion != "s" and opcion != "n":
+            opcion = input("\n¿Quieres volver a jugar? (S/N): ").lower()
+            if opcion == "s":
+                print("Nueva partida iniciada\n")
+            elif opcion == "n":
+                print("Gracias por jugar")
+                motor.cerrar_procesos()
+                return
+            else:
+                print("Opción inválida.")
+
+
+if __name__ == "__main__":
+    # python practica4.33.py filas columnas k [procesos]  juega en un tablero mas grande con el motor de bitboards
+    # python practica4.33.py --tabla          vuelve a generar la tabla de jugadas perfectas
+    # python practica4.33.py --verificar      revisa las busquedas contra la tabla
+    # python practica4.33.py --paralela       revisa que la busqueda en paralelo elija lo mismo que la secuencial
+    if len(sys.argv) == 2 and sys.argv[1] == "--tabla":
+        guardar_tabla_gato(resolver_gato())
+        print(f"Tabla guardada en {ARCHIVO_TABLA}")
+    elif len(sys.argv) == 2 and sys.argv[1] == "--verificar":
+        errores = verificar_contra_tabla()
+        print(f"Posiciones con jugada no perfecta: {len(errores)}")
+    elif len(sys.argv) == 2 and sys.argv[1] == "--paralela":
+        errores = verificar_paralela()
+        print(f"Posiciones donde la busqueda en paralelo elige otra jugada: {len(errores)}")
+    elif len(sys.argv) in (4, 5):
+        procesos = int(sys.argv[4]) if len(sys.argv) == 5 else None
+        jugar_mnk(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), procesos=procesos)
+    else:
+        jugar()